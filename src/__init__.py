@@ -3,7 +3,9 @@ MobileAgent Source Modules
 
 Core modules for AI agent device automation:
 - adb_helper: ADB command wrapper
+- async_adb: asyncio ADB wrapper for multi-device control
 - logger: Unified logging
+- data_utils: Dataclass options and JSON output helpers
 - executor: Deterministic execution with Element-First strategy
 - tool_router: Unified MCP/ADB tool interface
 - state_tracker: Navigation state machine and visited tracking
@@ -49,3 +51,11 @@ try:
     )
 except ImportError:
     pass
+
+
+def __getattr__(name):
+    # asyncio helper is imported on first use, so `import src` stays light
+    if name == "AsyncADBHelper":
+        from .async_adb import AsyncADBHelper
+        return AsyncADBHelper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
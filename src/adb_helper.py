@@ -12,12 +12,22 @@ Usage:
     # Or use standalone functions
     from src.adb_helper import tap, swipe, type_text, screenshot
 """
+import io
 import os
+import logging
 import sys
 import subprocess
 import time
 import base64
+import shlex
+import shutil
+import functools
+import uuid
+import queue
+import atexit
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Setup paths
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -27,6 +37,12 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
 # Directories
 OUTPUTS_DIR = os.path.join(PROJECT_ROOT, "outputs")
 TEMP_DIR = os.path.join(PROJECT_ROOT, "temp")
@@ -68,7 +84,8 @@ KEYCODE = {
 # Execute ADB command and return (success, output)
 def run_adb(args, timeout=30):
     cmd = ["adb"] + args
-    logger.debug(f"Executing: {' '.join(cmd)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Executing: %s", " ".join(cmd))
 
     try:
         result = subprocess.run(
@@ -90,61 +107,295 @@ def run_adb(args, timeout=30):
         return False, "adb not found"
 
 
+# Execute ADB command and return (success, stdout bytes) without decoding or stripping
+def run_adb_raw(args, timeout=30):
+    cmd = ["adb"] + args
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Executing (raw): %s", " ".join(cmd))
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+        if result.returncode == 0:
+            return True, result.stdout
+        logger.error(f"ADB error: {result.stderr.decode('utf-8', errors='replace').strip()}")
+        return False, result.stdout
+    except subprocess.TimeoutExpired:
+        logger.error("ADB command timeout")
+        return False, b""
+    except FileNotFoundError:
+        logger.error("ADB not found, please install Android platform-tools")
+        return False, b""
+
+
+_server_started = False
+_adb_missing = False
+_server_lock = threading.Lock()
+
+
+# Start the adb server once per process, so later commands never pay for autostart
+# (a missing adb binary is remembered too, so it is reported only once)
+def ensure_server():
+    global _server_started, _adb_missing
+    with _server_lock:
+        if _server_started:
+            return True
+        if _adb_missing:
+            return False
+        try:
+            result = subprocess.run(["adb", "start-server"], capture_output=True, timeout=5)
+            _server_started = result.returncode == 0
+        except FileNotFoundError:
+            _adb_missing = True
+            logger.error("ADB not found, please install Android platform-tools")
+        except subprocess.TimeoutExpired:
+            logger.warning("adb start-server timeout")
+        return _server_started
+
+
+# =============================================================================
+# Persistent Shell
+# =============================================================================
+
+class _PersistentShell:
+    """
+    Long-lived `adb shell` process fed through stdin/stdout pipes.
+
+    Every command is followed by a sentinel echo carrying its exit status,
+    which delimits the output without spawning a new adb process per call.
+    """
+
+    def __init__(self, serial=None):
+        self.serial = serial
+        self._lock = threading.Lock()
+        self._lines = queue.Queue()
+
+        cmd = ["adb"]
+        if serial:
+            cmd += ["-s", serial]
+        cmd.append("shell")
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+
+        # Reader thread keeps timeouts portable (select() does not work on pipes on Windows)
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        # stderr is drained separately so callers only ever parse stdout
+        self._err_reader = threading.Thread(target=self._log_stderr, daemon=True)
+        self._err_reader.start()
+
+    def _read_loop(self):
+        for line in iter(self._proc.stdout.readline, b""):
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _log_stderr(self):
+        for line in iter(self._proc.stderr.readline, b""):
+            logger.debug("Shell [%s] stderr: %s", self.serial or 'default',
+                         line.decode("utf-8", errors="replace").rstrip("\r\n"))
+
+    def alive(self):
+        return self._proc.poll() is None
+
+    # Run one command and return (success, output)
+    # OSError means the command was never sent; EOFError/TimeoutError mean it may have run
+    def run(self, command, timeout=30):
+        sentinel = f"__END_{uuid.uuid4().hex}__"
+        payload = f"{command} </dev/null; echo {sentinel}$?\n".encode("utf-8")
+
+        with self._lock:
+            self._proc.stdin.write(payload)
+            self._proc.stdin.flush()
+
+            deadline = time.monotonic() + timeout
+            output = []
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(command)
+                try:
+                    line = self._lines.get(timeout=remaining)
+                except queue.Empty:
+                    raise TimeoutError(command)
+                if line is None:
+                    raise EOFError("adb shell exited")
+
+                line = line.decode("utf-8", errors="replace").rstrip("\r\n")
+                idx = line.find(sentinel)
+                if idx < 0:
+                    output.append(line)
+                    continue
+
+                # Output without a trailing newline shares the sentinel line
+                if idx > 0:
+                    output.append(line[:idx])
+                status = line[idx + len(sentinel):].strip()
+                return status == "0", "\n".join(output).strip()
+
+    def close(self):
+        if self._proc.poll() is None:
+            try:
+                self._proc.stdin.close()
+                self._proc.terminate()
+                self._proc.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+
+
+_shells = {}
+_shells_lock = threading.Lock()
+
+
+# Get (or lazily start) the persistent shell for a device
+def _get_shell(serial=None):
+    with _shells_lock:
+        shell = _shells.get(serial)
+        if shell is None or not shell.alive():
+            shell = _PersistentShell(serial)
+            _shells[serial] = shell
+        return shell
+
+
+# Terminate the persistent shell for a device
+def close_shell(serial=None):
+    with _shells_lock:
+        shell = _shells.pop(serial, None)
+    if shell:
+        shell.close()
+
+
+# Terminate all persistent shells
+def close_all_shells():
+    with _shells_lock:
+        shells = list(_shells.values())
+        _shells.clear()
+    for shell in shells:
+        shell.close()
+
+
+atexit.register(close_all_shells)
+
+
+# Execute `adb shell <args>` over the persistent shell and return (success, output)
+def run_adb_shell(args, serial=None, timeout=30):
+    command = " ".join(args)
+    logger.debug("Shell [%s]: %s", serial or 'default', command)
+
+    try:
+        ok, output = _get_shell(serial).run(command, timeout)
+    except TimeoutError:
+        # The command may still be running; never replay it on a fresh process
+        logger.error("ADB shell command timeout")
+        close_shell(serial)
+        return False, "timeout"
+    except EOFError:
+        # Shell died after the command was sent; replaying it could repeat a tap or input
+        logger.error("ADB shell exited while running command")
+        close_shell(serial)
+        return False, "adb shell exited"
+    except (OSError, ValueError) as e:
+        logger.debug(f"Persistent shell unavailable ({e}), using one-shot adb shell")
+        close_shell(serial)
+        fallback = ["shell"] + list(args)
+        if serial:
+            fallback = ["-s", serial] + fallback
+        return run_adb(fallback, timeout)
+
+    if not ok:
+        logger.error(f"ADB shell error: {output}")
+    return ok, output
+
+
+# =============================================================================
+# Device State Cache
+# =============================================================================
+
+# Seconds before the current IME is queried again
+IME_CACHE_TTL = 5.0
+
+# Seconds a successful `adb devices` listing is reused
+DEVICES_CACHE_TTL = 1.0
+
+# Per-serial caches for values that rarely change during a session
+_screen_size_cache = {}
+_adbkeyboard_installed_cache = {}
+_current_ime_cache = {}
+_devices_cache = {"ts": 0.0, "devices": None}
+
+
+# Drop cached device state (e.g. after rotation or a manual IME switch)
+def invalidate_cache(serial=None):
+    _screen_size_cache.pop(serial, None)
+    _adbkeyboard_installed_cache.pop(serial, None)
+    _current_ime_cache.pop(serial, None)
+
+
 # =============================================================================
 # Device Management
 # =============================================================================
 
-# List all connected devices
+# List all connected devices (cached for DEVICES_CACHE_TTL seconds)
 def list_devices():
+    cached = _devices_cache["devices"]
+    if cached is not None and time.monotonic() - _devices_cache["ts"] < DEVICES_CACHE_TTL:
+        return list(cached)
+
     ok, output = run_adb(["devices"])
     if not ok:
         return []
 
-    devices = []
-    for line in output.split("\n")[1:]:
-        if "\t" in line:
-            serial, status = line.split("\t")
-            if status == "device":
-                devices.append(serial)
-    return devices
+    # Skip the "List of devices attached" header; rows are "<serial>\t<state>"
+    devices = [parts[0] for line in output.splitlines()[1:]
+               if len(parts := line.split("\t")) == 2 and parts[1] == "device"]
+    _devices_cache["devices"] = devices
+    _devices_cache["ts"] = time.monotonic()
+    return list(devices)
 
 
 # Get device model name
 def get_device_model(serial=None):
-    args = ["shell", "getprop", "ro.product.model"]
-    if serial:
-        args = ["-s", serial] + args
-    ok, output = run_adb(args)
+    ok, output = run_adb_shell(["getprop", "ro.product.model"], serial)
     return output if ok else None
 
 
 # Get screen size as (width, height)
 def get_screen_size(serial=None):
-    args = ["shell", "wm", "size"]
-    if serial:
-        args = ["-s", serial] + args
-    ok, output = run_adb(args)
+    cached = _screen_size_cache.get(serial)
+    if cached:
+        return cached
+
+    ok, output = run_adb_shell(["wm", "size"], serial)
     if ok and "Physical size:" in output:
         size = output.split(":")[-1].strip()
         w, h = size.split("x")
+        _screen_size_cache[serial] = (int(w), int(h))
         return int(w), int(h)
     return None, None
 
 
 # Get comprehensive device information
 def get_device_info(serial=None):
-    info = {
-        "serial": serial or list_devices()[0] if list_devices() else None,
-        "model": get_device_model(serial),
-        "screen_size": get_screen_size(serial),
-    }
-    
-    # Get Android version
-    args = ["shell", "getprop", "ro.build.version.release"]
-    if serial:
-        args = ["-s", serial] + args
-    ok, version = run_adb(args)
-    info["android_version"] = version if ok else None
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # `adb devices` is its own process, so resolve the serial while the shell queries run
+        devices_future = None if serial else pool.submit(list_devices)
+
+        info = {
+            "serial": serial,
+            "model": get_device_model(serial),
+            "screen_size": get_screen_size(serial),
+        }
+
+        # Get Android version
+        ok, version = run_adb_shell(["getprop", "ro.build.version.release"], serial)
+        info["android_version"] = version if ok else None
+
+        if devices_future:
+            devices = devices_future.result()
+            info["serial"] = devices[0] if devices else None
     
     return info
 
@@ -153,29 +404,57 @@ def get_device_info(serial=None):
 # Screenshot
 # =============================================================================
 
-# Take screenshot and save to local
-def screenshot(output_path=None, serial=None, prefix="screen"):
+# Capture the screen as PNG bytes (no file written)
+def _screencap_raw(serial=None):
+    args = ["exec-out", "screencap", "-p"]
+    if serial:
+        args = ["-s", serial] + args
+
+    ok, data = run_adb_raw(args, timeout=10)
+    if ok and data:
+        return data
+    logger.error("Screenshot failed")
+    return None
+
+
+# Write PNG bytes to output_path (or a timestamped file in OUTPUTS_DIR)
+def _save_png(data, output_path=None, prefix="screen"):
     if output_path is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_path = os.path.join(OUTPUTS_DIR, f"{prefix}_{timestamp}.png")
 
-    args = ["exec-out", "screencap", "-p"]
-    if serial:
-        args = ["-s", serial] + args
+    with open(output_path, "wb") as f:
+        f.write(data)
+    logger.info(f"Screenshot saved: {output_path}")
+    return output_path
 
-    cmd = ["adb"] + args
-    logger.info(f"Taking screenshot: {output_path}")
 
+# Take screenshot and save to local
+def screenshot(output_path=None, serial=None, prefix="screen"):
+    logger.info(f"Taking screenshot ({prefix})")
+    data = _screencap_raw(serial)
+    if not data:
+        return None
     try:
-        result = subprocess.run(cmd, capture_output=True, timeout=10)
-        if result.returncode == 0 and result.stdout:
-            with open(output_path, "wb") as f:
-                f.write(result.stdout)
-            logger.info(f"Screenshot saved: {output_path}")
-            return output_path
-    except Exception as e:
+        return _save_png(data, output_path, prefix)
+    except OSError as e:
         logger.error(f"Screenshot failed: {e}")
-    return None
+        return None
+
+
+# Take screenshot and return the PNG bytes, for callers that never need a file
+def screenshot_bytes(serial=None):
+    return _screencap_raw(serial)
+
+
+# Take screenshot as a PIL Image (requires Pillow)
+def screenshot_image(serial=None):
+    if not PIL_AVAILABLE:
+        raise ImportError("Pillow not installed. Run: pip install pillow")
+    data = _screencap_raw(serial)
+    if not data:
+        return None
+    return Image.open(io.BytesIO(data))
 
 
 # =============================================================================
@@ -184,11 +463,9 @@ def screenshot(output_path=None, serial=None, prefix="screen"):
 
 # Tap at screen coordinates
 def tap(x, y, serial=None):
-    args = ["shell", "input", "tap", str(int(x)), str(int(y))]
-    if serial:
-        args = ["-s", serial] + args
+    args = ["input", "tap", str(int(x)), str(int(y))]
     logger.info(f"Tap at ({x}, {y})")
-    return run_adb(args)
+    return run_adb_shell(args, serial)
 
 
 # Double tap at screen coordinates
@@ -200,24 +477,20 @@ def double_tap(x, y, serial=None, interval_ms=100):
 
 # Long press at screen coordinates
 def long_press(x, y, duration_ms=1000, serial=None):
-    args = ["shell", "input", "swipe", 
+    args = ["input", "swipe",
             str(int(x)), str(int(y)), str(int(x)), str(int(y)), str(duration_ms)]
-    if serial:
-        args = ["-s", serial] + args
     logger.info(f"Long press at ({x}, {y}) for {duration_ms}ms")
-    return run_adb(args)
+    return run_adb_shell(args, serial)
 
 
 # Swipe from (x1, y1) to (x2, y2)
 def swipe(x1, y1, x2, y2, duration_ms=300, serial=None):
-    args = ["shell", "input", "swipe",
+    args = ["input", "swipe",
             str(int(x1)), str(int(y1)),
             str(int(x2)), str(int(y2)),
             str(duration_ms)]
-    if serial:
-        args = ["-s", serial] + args
     logger.info(f"Swipe ({x1},{y1}) -> ({x2},{y2})")
-    return run_adb(args)
+    return run_adb_shell(args, serial)
 
 
 # Scroll up (swipe from bottom to top)
@@ -240,34 +513,36 @@ def scroll_down(serial=None):
 # Text Input (ADBKeyboard)
 # =============================================================================
 
-# Check if ADBKeyboard is installed
+# Check if ADBKeyboard is installed (positive result cached for the session)
 def is_adbkeyboard_installed(serial=None):
-    args = ["shell", "pm", "list", "packages", ADBKEYBOARD_PACKAGE]
-    if serial:
-        args = ["-s", serial] + args
-    ok, output = run_adb(args)
-    return ADBKEYBOARD_PACKAGE in output
+    if _adbkeyboard_installed_cache.get(serial):
+        return True
+
+    ok, output = run_adb_shell(["pm", "list", "packages", ADBKEYBOARD_PACKAGE], serial)
+    installed = ADBKEYBOARD_PACKAGE in output
+    if installed:
+        _adbkeyboard_installed_cache[serial] = True
+    return installed
 
 
-# Get current input method
+# Get current input method (cached for IME_CACHE_TTL seconds)
 def get_current_ime(serial=None):
-    args = ["shell", "settings", "get", "secure", "default_input_method"]
-    if serial:
-        args = ["-s", serial] + args
-    ok, output = run_adb(args)
-    return output if ok else None
+    cached = _current_ime_cache.get(serial)
+    if cached and time.monotonic() - cached[0] < IME_CACHE_TTL:
+        return cached[1]
+
+    ok, output = run_adb_shell(["settings", "get", "secure", "default_input_method"], serial)
+    if not ok:
+        return None
+    _current_ime_cache[serial] = (time.monotonic(), output)
+    return output
 
 
 # Enable ADBKeyboard and set as default IME
 def enable_adbkeyboard(serial=None):
-    args_enable = ["shell", "ime", "enable", ADBKEYBOARD_IME]
-    args_set = ["shell", "ime", "set", ADBKEYBOARD_IME]
-    if serial:
-        args_enable = ["-s", serial] + args_enable
-        args_set = ["-s", serial] + args_set
-    
-    run_adb(args_enable)
-    run_adb(args_set)
+    run_adb_shell(["ime", "enable", ADBKEYBOARD_IME], serial)
+    run_adb_shell(["ime", "set", ADBKEYBOARD_IME], serial)
+    _current_ime_cache.pop(serial, None)
     return get_current_ime(serial) == ADBKEYBOARD_IME
 
 
@@ -297,6 +572,12 @@ def setup_adbkeyboard(serial=None):
     return False, "Installed but failed to enable"
 
 
+# Base64 payload for ADBKeyboard, memoized for repeated queries
+@functools.lru_cache(maxsize=256)
+def _b64_encode(text):
+    return base64.b64encode(text.encode('utf-8')).decode('ascii')
+
+
 # Type text on device, supports Unicode via ADBKeyboard
 def type_text(text, serial=None, use_adbkeyboard=True):
     if use_adbkeyboard:
@@ -312,23 +593,18 @@ def type_text(text, serial=None, use_adbkeyboard=True):
     
     if use_adbkeyboard and is_adbkeyboard_installed(serial):
         # Use ADBKeyboard (supports Unicode)
-        encoded = base64.b64encode(text.encode('utf-8')).decode('ascii')
-        args = ["shell", "am", "broadcast", "-a", "ADB_INPUT_B64", "--es", "msg", encoded]
-        if serial:
-            args = ["-s", serial] + args
+        encoded = _b64_encode(text)
+        args = ["am", "broadcast", "-a", "ADB_INPUT_B64", "--es", "msg", encoded]
         logger.info(f"Type text via ADBKeyboard: {text[:50]}...")
-        ok, output = run_adb(args)
+        ok, output = run_adb_shell(args, serial)
         if ok and "result=0" in output:
             return True, "Text input successful"
         return False, f"Input failed: {output}"
     else:
         # Basic input (ASCII only)
         safe_text = text.replace(" ", "%s").replace("'", "\\'").replace('"', '\\"')
-        args = ["shell", "input", "text", safe_text]
-        if serial:
-            args = ["-s", serial] + args
         logger.info(f"Type text via basic input: {text[:50]}...")
-        return run_adb(args)
+        return run_adb_shell(["input", "text", safe_text], serial)
 
 
 # Tap input field and type text
@@ -345,15 +621,22 @@ def tap_and_type(x, y, text, serial=None, wait_ms=500):
     return type_text(text, serial)
 
 
+# Max keycodes per `input keyevent` call, keeps the command line well under ARG_MAX
+KEYEVENT_BATCH_SIZE = 500
+
+
 # Clear text by sending DELETE key multiple times
 def clear_text(length=100, serial=None):
-    args = ["shell", "input", "keyevent"]
-    if serial:
-        args = ["-s", serial] + args
-    
-    # Send DELETE key
-    for _ in range(length):
-        run_adb(args + [str(KEYCODE["DELETE"])])
+    delete = str(KEYCODE["DELETE"])
+
+    # `input keyevent` accepts several keycodes, so send them in batches
+    sent = 0
+    while sent < length:
+        batch = min(KEYEVENT_BATCH_SIZE, length - sent)
+        ok, output = run_adb_shell(["input", "keyevent"] + [delete] * batch, serial)
+        if not ok:
+            return False, f"Clear failed after {sent} DELETE keys: {output}"
+        sent += batch
     
     return True, f"Sent {length} DELETE keys"
 
@@ -364,11 +647,8 @@ def clear_text(length=100, serial=None):
 
 # Press a key by keycode
 def press_key(keycode, serial=None):
-    args = ["shell", "input", "keyevent", str(keycode)]
-    if serial:
-        args = ["-s", serial] + args
     logger.info(f"Press key: {keycode}")
-    return run_adb(args)
+    return run_adb_shell(["input", "keyevent", str(keycode)], serial)
 
 
 # Press a key by name (e.g., 'HOME', 'BACK', 'ENTER')
@@ -400,34 +680,28 @@ def press_enter(serial=None):
 
 # Launch an app by package name
 def launch_app(package, serial=None):
-    args = ["shell", "monkey", "-p", package, "-c",
+    args = ["monkey", "-p", package, "-c",
             "android.intent.category.LAUNCHER", "1"]
-    if serial:
-        args = ["-s", serial] + args
     logger.info(f"Launch app: {package}")
-    return run_adb(args)
+    return run_adb_shell(args, serial)
 
 
 # Force stop an app
 def stop_app(package, serial=None):
-    args = ["shell", "am", "force-stop", package]
-    if serial:
-        args = ["-s", serial] + args
     logger.info(f"Stop app: {package}")
-    return run_adb(args)
+    return run_adb_shell(["am", "force-stop", package], serial)
 
 
-# List installed packages
+# List installed packages (filter is a case-insensitive substring, applied on device)
 def list_packages(serial=None, filter_text=None):
-    args = ["shell", "pm", "list", "packages"]
-    if serial:
-        args = ["-s", serial] + args
-    ok, output = run_adb(args)
+    args = ["pm", "list", "packages"]
+    if filter_text:
+        # grep exits 1 on no match, which is not an error here
+        args += ["|", "sed", "s/^package://", "|",
+                 "grep", "-iF", "--", shlex.quote(filter_text), "||", "true"]
+    ok, output = run_adb_shell(args, serial)
     if ok:
-        packages = [line.replace("package:", "") for line in output.split("\n")]
-        if filter_text:
-            packages = [p for p in packages if filter_text.lower() in p.lower()]
-        return packages
+        return [line.replace("package:", "").strip() for line in output.split("\n") if line.strip()]
     return []
 
 
@@ -482,6 +756,12 @@ class ADBHelper:
     # Initialize with optional device ID
     def __init__(self, device_id=None):
         self.device_id = device_id
+
+        # Last screenshot, reused while the UI hash stays the same
+        self._last_screen_hash = None
+        self._last_screen_path = None
+
+        ensure_server()
         if not self.device_id:
             devices = list_devices()
             if devices:
@@ -532,6 +812,39 @@ class ADBHelper:
     
     def screenshot(self, output_path=None, prefix="screen"):
         return screenshot(output_path, self.device_id, prefix)
+
+    def screenshot_bytes(self):
+        return screenshot_bytes(self.device_id)
+
+    def screenshot_image(self):
+        return screenshot_image(self.device_id)
+
+    # Screenshot only if the UI hash changed since the last capture, else reuse it
+    def screenshot_if_changed(self, current_hash, output_path=None, prefix="screen"):
+        last_path = self._last_screen_path
+        if (current_hash and current_hash == self._last_screen_hash
+                and last_path and os.path.exists(last_path)):
+            logger.debug("Screen unchanged (%s), reusing last capture", current_hash)
+            if output_path is None or os.path.abspath(output_path) == os.path.abspath(last_path):
+                return last_path
+            try:
+                shutil.copyfile(last_path, output_path)
+                return output_path
+            except OSError as e:
+                logger.warning(f"Reusing last capture failed: {e}, taking a new one")
+
+        data = _screencap_raw(self.device_id)
+        if not data:
+            return None
+        try:
+            path = _save_png(data, output_path, prefix)
+        except OSError as e:
+            logger.error(f"Screenshot failed: {e}")
+            return None
+        # Only the path is kept: the PNG itself stays on disk, not in memory
+        self._last_screen_hash = current_hash
+        self._last_screen_path = path
+        return path
     
     def launch_app(self, package):
         return launch_app(package, self.device_id)
@@ -554,6 +867,13 @@ class ADBHelper:
     def setup_adbkeyboard(self):
         return setup_adbkeyboard(self.device_id)
 
+    def invalidate_cache(self):
+        invalidate_cache(self.device_id)
+
+    # Terminate this device's persistent shell (restarted lazily on next use)
+    def close(self):
+        close_shell(self.device_id)
+
 
 # =============================================================================
 # Main (for testing)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Async ADB Helper - asyncio interface for driving devices concurrently
+
+Mirrors the core of adb_helper with coroutines built on
+asyncio.create_subprocess_exec, so commands for several devices (or a
+screenshot transfer and the next tap) can overlap instead of blocking.
+Single-device scripts can keep using the synchronous ADBHelper.
+
+Usage:
+    from src.adb_helper import list_devices
+    from src.async_adb import AsyncADBHelper
+
+    helpers = [AsyncADBHelper(serial) for serial in list_devices()]
+    await asyncio.gather(*(h.tap(540, 1200) for h in helpers))
+"""
+import os
+import sys
+import asyncio
+import logging
+import base64
+from datetime import datetime
+
+# Setup paths
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+
+from logger import get_logger
+from adb_helper import (
+    OUTPUTS_DIR,
+    KEYCODE,
+    ADBKEYBOARD_PACKAGE,
+    ADBKEYBOARD_IME,
+    list_devices,
+)
+
+logger = get_logger(__name__)
+
+
+# Prefix args with the device serial when given
+def _with_serial(args, serial=None):
+    if serial:
+        return ["-s", serial] + args
+    return args
+
+
+# Execute ADB command and return (returncode, stdout bytes, stderr bytes)
+async def _exec_adb(args, timeout=30):
+    cmd = ["adb"] + args
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Executing (async): %s", " ".join(cmd))
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError:
+        logger.error("ADB not found, please install Android platform-tools")
+        return None, b"", b"adb not found"
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        logger.error("ADB command timeout")
+        return None, b"", b"timeout"
+
+    return proc.returncode, stdout, stderr
+
+
+# Execute ADB command asynchronously and return (success, output)
+async def run_adb_async(args, timeout=30):
+    returncode, stdout, stderr = await _exec_adb(args, timeout)
+    if returncode == 0:
+        return True, stdout.decode("utf-8", errors="replace").strip()
+
+    error = stderr.decode("utf-8", errors="replace").strip()
+    if returncode is not None:
+        logger.error(f"ADB error: {error}")
+    return False, error
+
+
+# =============================================================================
+# Screenshot
+# =============================================================================
+
+# Write a file (run via asyncio.to_thread so disk I/O stays off the event loop)
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+# Take screenshot and save to local
+async def screenshot(output_path=None, serial=None, prefix="screen"):
+    if output_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(OUTPUTS_DIR, f"{prefix}_{timestamp}.png")
+
+    logger.info(f"Taking screenshot: {output_path}")
+    returncode, stdout, stderr = await _exec_adb(
+        _with_serial(["exec-out", "screencap", "-p"], serial), timeout=10
+    )
+    if returncode == 0 and stdout:
+        try:
+            await asyncio.to_thread(_write_bytes, output_path, stdout)
+        except OSError as e:
+            logger.error(f"Screenshot failed: {e}")
+            return None
+        logger.info(f"Screenshot saved: {output_path}")
+        return output_path
+
+    logger.error(f"Screenshot failed: {stderr.decode('utf-8', errors='replace')}")
+    return None
+
+
+# =============================================================================
+# Touch Operations
+# =============================================================================
+
+# Tap at screen coordinates
+async def tap(x, y, serial=None):
+    logger.info(f"Tap at ({x}, {y})")
+    return await run_adb_async(
+        _with_serial(["shell", "input", "tap", str(int(x)), str(int(y))], serial)
+    )
+
+
+# Long press at screen coordinates
+async def long_press(x, y, duration_ms=1000, serial=None):
+    args = ["shell", "input", "swipe",
+            str(int(x)), str(int(y)), str(int(x)), str(int(y)), str(duration_ms)]
+    logger.info(f"Long press at ({x}, {y}) for {duration_ms}ms")
+    return await run_adb_async(_with_serial(args, serial))
+
+
+# Swipe from (x1, y1) to (x2, y2)
+async def swipe(x1, y1, x2, y2, duration_ms=300, serial=None):
+    args = ["shell", "input", "swipe",
+            str(int(x1)), str(int(y1)),
+            str(int(x2)), str(int(y2)),
+            str(duration_ms)]
+    logger.info(f"Swipe ({x1},{y1}) -> ({x2},{y2})")
+    return await run_adb_async(_with_serial(args, serial))
+
+
+# =============================================================================
+# Text Input (ADBKeyboard)
+# =============================================================================
+
+# Check if ADBKeyboard is installed
+async def is_adbkeyboard_installed(serial=None):
+    ok, output = await run_adb_async(
+        _with_serial(["shell", "pm", "list", "packages", ADBKEYBOARD_PACKAGE], serial)
+    )
+    return ADBKEYBOARD_PACKAGE in output
+
+
+# Get current input method
+async def get_current_ime(serial=None):
+    ok, output = await run_adb_async(
+        _with_serial(["shell", "settings", "get", "secure", "default_input_method"], serial)
+    )
+    return output if ok else None
+
+
+# Type text on device, supports Unicode via ADBKeyboard (install it with setup_adbkeyboard)
+async def type_text(text, serial=None, use_adbkeyboard=True):
+    if use_adbkeyboard:
+        installed, ime = await asyncio.gather(
+            is_adbkeyboard_installed(serial),
+            get_current_ime(serial)
+        )
+        if not installed:
+            logger.warning("ADBKeyboard not installed, falling back to basic input")
+            use_adbkeyboard = False
+        elif ime != ADBKEYBOARD_IME:
+            await run_adb_async(_with_serial(["shell", "ime", "enable", ADBKEYBOARD_IME], serial))
+            await run_adb_async(_with_serial(["shell", "ime", "set", ADBKEYBOARD_IME], serial))
+            await asyncio.sleep(0.3)
+
+    if use_adbkeyboard:
+        encoded = base64.b64encode(text.encode('utf-8')).decode('ascii')
+        args = ["shell", "am", "broadcast", "-a", "ADB_INPUT_B64", "--es", "msg", encoded]
+        logger.info(f"Type text via ADBKeyboard: {text[:50]}...")
+        ok, output = await run_adb_async(_with_serial(args, serial))
+        if ok and "result=0" in output:
+            return True, "Text input successful"
+        return False, f"Input failed: {output}"
+
+    # Basic input (ASCII only)
+    safe_text = text.replace(" ", "%s").replace("'", "\\'").replace('"', '\\"')
+    logger.info(f"Type text via basic input: {text[:50]}...")
+    return await run_adb_async(_with_serial(["shell", "input", "text", safe_text], serial))
+
+
+# =============================================================================
+# Key Events
+# =============================================================================
+
+# Press a key by keycode
+async def press_key(keycode, serial=None):
+    logger.info(f"Press key: {keycode}")
+    return await run_adb_async(_with_serial(["shell", "input", "keyevent", str(keycode)], serial))
+
+
+# =============================================================================
+# App Management
+# =============================================================================
+
+# Launch an app by package name
+async def launch_app(package, serial=None):
+    args = ["shell", "monkey", "-p", package, "-c",
+            "android.intent.category.LAUNCHER", "1"]
+    logger.info(f"Launch app: {package}")
+    return await run_adb_async(_with_serial(args, serial))
+
+
+# Force stop an app
+async def stop_app(package, serial=None):
+    logger.info(f"Stop app: {package}")
+    return await run_adb_async(_with_serial(["shell", "am", "force-stop", package], serial))
+
+
+# =============================================================================
+# AsyncADBHelper Class (Stateful wrapper)
+# =============================================================================
+
+class AsyncADBHelper:
+    """
+    Async counterpart of ADBHelper, bound to one device.
+
+    Usage:
+        adb = AsyncADBHelper()  # Auto-detect device
+        await adb.tap(540, 1200)
+
+        # Screenshot transfer overlaps with the next action
+        shot, _ = await asyncio.gather(adb.screenshot(prefix="step"), adb.swipe(540, 1600, 540, 600))
+    """
+
+    # Initialize with optional device ID (detection is a one-off blocking call)
+    def __init__(self, device_id=None):
+        self.device_id = device_id
+        if not self.device_id:
+            devices = list_devices()
+            if devices:
+                self.device_id = devices[0]
+                logger.info(f"Auto-detected device: {self.device_id}")
+
+    async def tap(self, x, y):
+        return await tap(x, y, self.device_id)
+
+    async def long_press(self, x, y, duration_ms=1000):
+        return await long_press(x, y, duration_ms, self.device_id)
+
+    async def swipe(self, x1, y1, x2, y2, duration_ms=300):
+        return await swipe(x1, y1, x2, y2, duration_ms, self.device_id)
+
+    async def type_text(self, text):
+        return await type_text(text, self.device_id)
+
+    async def press_key(self, keycode):
+        return await press_key(keycode, self.device_id)
+
+    async def press_home(self):
+        return await press_key(KEYCODE["HOME"], self.device_id)
+
+    async def press_back(self):
+        return await press_key(KEYCODE["BACK"], self.device_id)
+
+    async def press_enter(self):
+        return await press_key(KEYCODE["ENTER"], self.device_id)
+
+    async def screenshot(self, output_path=None, prefix="screen"):
+        return await screenshot(output_path, self.device_id, prefix)
+
+    async def launch_app(self, package):
+        return await launch_app(package, self.device_id)
+
+    async def stop_app(self, package):
+        return await stop_app(package, self.device_id)
+
+
+# =============================================================================
+# Main (for testing)
+# =============================================================================
+
+async def _main():
+    devices = list_devices()
+    print(f"Connected devices: {devices}")
+
+    helpers = [AsyncADBHelper(serial) for serial in devices]
+    shots = await asyncio.gather(*(h.screenshot(prefix=f"async_{i}") for i, h in enumerate(helpers)))
+    for serial, path in zip(devices, shots):
+        print(f"{serial}: {path}")
+
+
+if __name__ == "__main__":
+    print("=== Async ADB Helper Test ===\n")
+    asyncio.run(_main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Data Utils - Dataclass options and JSON output shared across modules.
+
+Usage:
+    from src.data_utils import DATACLASS_SLOTS, write_json, json_line
+
+    @dataclass(**DATACLASS_SLOTS)
+    class Record:
+        name: str = ""
+
+    write_json("report.json", Record("a"))
+    sink.write(json_line(Record("b")))
+"""
+import sys
+import json
+from dataclasses import asdict
+from typing import Any
+
+# orjson serializes in C; json module otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Slotted dataclasses (no per-instance __dict__) where the interpreter supports them
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def write_json(path: str, data: Any):
+    """
+    Write data as indented UTF-8 JSON (non-string keys become strings, as in json).
+
+    Dataclass instances are serialized field by field; orjson walks them
+    natively, without building intermediate dicts.
+    """
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=asdict)
+
+
+def json_line(data: Any) -> bytes:
+    """Encode data as one compact UTF-8 JSON line (dataclasses field by field), for JSONL"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, default=asdict) + "\n").encode('utf-8')
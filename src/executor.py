@@ -21,10 +21,18 @@ import sys
 import json
 import time
 import hashlib
+import functools
+import itertools
+import operator
 import re
+import string
 import subprocess
-import xml.etree.ElementTree as ET
-from typing import Optional, Dict, List, Tuple, Any, Callable, Union
+import tempfile
+from xml.parsers import expat
+from collections import deque
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Any, Callable, Union, Deque
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -33,10 +41,235 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
 from logger import get_logger
-from adb_helper import ADBHelper, run_adb, tap, swipe, press_back
+from adb_helper import ADBHelper, run_adb, run_adb_raw, run_adb_shell, tap, swipe, press_back
+from data_utils import DATACLASS_SLOTS, write_json
 
 logger = get_logger(__name__)
 
+# Process start time and failure counter, name debug artifact directories
+RUN_ID = datetime.now().strftime("%Y%m%d_%H%M%S")
+_artifact_counter = itertools.count(1)
+
+# lxml parses uiautomator dumps in C; the stdlib fallback is a bare expat parser
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+    XMLParseError = (etree.XMLSyntaxError, expat.ExpatError)
+except ImportError:
+    etree = None
+    LXML_AVAILABLE = False
+    XMLParseError = expat.ExpatError
+
+class _NodeCollector:
+    """lxml parser target: collects the attributes of each <node> start tag"""
+
+    __slots__ = ('_nodes', 'rotation')
+
+    def __init__(self, nodes: List[Dict[str, str]]):
+        self._nodes = nodes
+        self.rotation = None
+
+    def start(self, tag, attrib):
+        if tag == 'node':
+            self._nodes.append(dict(attrib))
+        elif tag == 'hierarchy':
+            self.rotation = attrib.get('rotation')
+
+    def end(self, tag):
+        pass
+
+    def close(self):
+        return self._nodes
+
+
+class _LazyElements(Sequence):
+    """
+    Element list over parsed uiautomator node attributes.
+
+    Each Element is built the first time its index is read, so a screen that
+    is only searched (the column search works on the attributes directly)
+    builds just the elements it returns.
+    """
+
+    __slots__ = ('nodes', '_build', '_built', '_reusable')
+
+    def __init__(self, nodes: List[Dict[str, str]], build: Callable[[Dict[str, str]], 'Element']):
+        self.nodes = nodes
+        self._build = build
+        self._built = [None] * len(nodes)
+        self._reusable = None
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.nodes)))]
+        element = self._built[index]
+        if element is None:
+            node = self.nodes[index]
+            if self._reusable:
+                element = self._reusable.pop(_node_values(node), None)
+                # Attributes outside the key (checked, selected, ...) must match too
+                if element is not None and element.raw != node:
+                    element = None
+            if element is None:
+                element = self._build(node)
+            self._built[index] = element
+        return element
+
+    def reuse_from(self, previous: '_LazyElements'):
+        """
+        Offer the Elements already built for an earlier dump: a node whose
+        attributes are all identical (raw included) takes the old Element
+        instead of building one.
+        After a scroll most nodes persist, so most lookups become a dict hit.
+        """
+        reusable = {}
+        for node, element in zip(previous.nodes, previous._built):
+            if element is not None:
+                reusable.setdefault(_node_values(node), element)
+        self._reusable = reusable or None
+
+    def __iter__(self):
+        for i in range(len(self.nodes)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, _LazyElements)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+# Class names and resource-ids repeat across a dump (a few dozen distinct values
+# per screen), so every Element shares one interned copy instead of its own string
+_intern = sys.intern
+
+
+@functools.lru_cache(maxsize=1024)
+def _interned_lower(value: str) -> str:
+    """Lowercase a repeated attribute once and share the interned result"""
+    return _intern(value.lower())
+
+
+# Search criterion -> comparator(element, value); substring values arrive lowercased
+_MATCHERS = {
+    'text': lambda e, v: v in e._text_lower,
+    'text_exact': lambda e, v: v == e.text,
+    'type': lambda e, v: v in e._element_type_lower,
+    'identifier': lambda e, v: v in e._identifier_lower,
+    'content_desc': lambda e, v: v in e._content_desc_lower,
+    'content_desc_exact': lambda e, v: v == e.content_desc,
+    'clickable': lambda e, v: e.clickable == v,
+    'scrollable': lambda e, v: e.scrollable == v,
+}
+
+# uiautomator2-style selector keys accepted by the non-u2 fallbacks
+_CRITERIA_ALIASES = {
+    'textContains': 'text',
+    'resourceId': 'identifier',
+    'className': 'type',
+    'description': 'content_desc_exact',
+    'descriptionContains': 'content_desc',
+}
+
+# Searchable Element field -> (<node> attribute, lowercasing used by substring
+# criteria; None for boolean flags). Element and the node-attribute columns of
+# ScreenState both derive their search values from this table.
+_SEARCH_FIELDS = {
+    'text': ('text', str.lower),
+    'content_desc': ('content-desc', str.lower),
+    'element_type': ('class', _interned_lower),
+    'identifier': ('resource-id', _interned_lower),
+    'clickable': ('clickable', None),
+    'scrollable': ('scrollable', None),
+}
+
+# Element fields with a lowercase copy: (field, copy attribute, lowercasing)
+_LOWERED_FIELDS = tuple((name, f'_{name}_lower', lower)
+                        for name, (_, lower) in _SEARCH_FIELDS.items() if lower)
+
+# Search criterion -> (Element field, comparison)
+_CRITERIA_FIELDS = {
+    'text': ('text', 'contains'),
+    'text_exact': ('text', 'equals'),
+    'type': ('element_type', 'contains'),
+    'identifier': ('identifier', 'contains'),
+    'content_desc': ('content_desc', 'contains'),
+    'content_desc_exact': ('content_desc', 'equals'),
+    'clickable': ('clickable', 'equals'),
+    'scrollable': ('scrollable', 'equals'),
+}
+
+# Search criterion -> (Element attribute, comparison) for ScreenState column search
+_CRITERIA_COLUMNS = {
+    key: (f'_{name}_lower' if kind == 'contains' else name, kind)
+    for key, (name, kind) in _CRITERIA_FIELDS.items()
+}
+
+# Search criterion -> (uiautomator2 selector key, comparison) for device-side waits
+_U2_SELECTOR_KEYS = {
+    'text': ('textMatches', 'contains'),
+    'text_exact': ('text', 'equals'),
+    'type': ('classNameMatches', 'contains'),
+    'identifier': ('resourceIdMatches', 'contains'),
+    'content_desc': ('descriptionMatches', 'contains'),
+    'content_desc_exact': ('description', 'equals'),
+    'clickable': ('clickable', 'equals'),
+    'scrollable': ('scrollable', 'equals'),
+}
+
+
+def _node_column(name: str, kind: str) -> Callable[[Dict[str, str]], Any]:
+    """Column value of one Element field read straight from <node> attributes"""
+    attr, lower = _SEARCH_FIELDS[name]
+    if lower is None:
+        return lambda a: a.get(attr) == 'true'
+    if kind == 'contains':
+        return lambda a: lower(a.get(attr, ''))
+    return lambda a: a.get(attr, '')
+
+
+# Search criterion -> column value straight from uiautomator node attributes
+_NODE_COLUMNS = {key: _node_column(name, kind) for key, (name, kind) in _CRITERIA_FIELDS.items()}
+
+# Separator for joined substring columns (never present in UI strings)
+_COLUMN_SEP = "\x00"
+
+# Number of recent screen states kept by DeterministicExecutor
+STATE_HISTORY_SIZE = 20
+
+# swipe_and_verify: minimum wait after the gesture, then the gap between dumps
+SWIPE_SETTLE_TIME = 0.2
+SWIPE_POLL_INTERVAL = 0.2
+
+# wait_until: gap between dumps while waiting for a screen condition
+WAIT_POLL_INTERVAL = 0.15
+
+# Fallback pattern for bounds strings that miss the "[x1,y1][x2,y2]" fast path
+_BOUNDS_RE = re.compile(r'\[(\d+),(\d+)\]')
+
+
+# <node> attributes read into an Element, and the values assumed when one is missing
+_NODE_ATTR_NAMES = ('text', 'content-desc', 'class', 'resource-id', 'bounds',
+                    'clickable', 'scrollable', 'focusable', 'enabled')
+_NODE_ATTRS = operator.itemgetter(*_NODE_ATTR_NAMES)
+_NODE_DEFAULTS = dict.fromkeys(_NODE_ATTR_NAMES, '')
+
+
+def _node_values(attrs: Dict[str, str]) -> Tuple[str, ...]:
+    """The Element-relevant attribute values of a node, in _NODE_ATTR_NAMES order"""
+    # uiautomator writes every attribute on every node: fetch them in one C call
+    try:
+        return _NODE_ATTRS(attrs)
+    except KeyError:
+        return _NODE_ATTRS({**_NODE_DEFAULTS, **attrs})
+
 
 # =============================================================================
 # Helper Functions
@@ -58,11 +291,40 @@ def _to_bool(value) -> bool:
     return bool(value)
 
 
+def _digest(parts) -> str:
+    """Stable 12-char hex digest of string parts (for screen comparison, not security).
+
+    Joins with a unit separator instead of building JSON, and uses blake2b so
+    hashes persisted by StateTracker stay comparable across processes.
+    """
+    data = "\x1f".join(parts).encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(data, digest_size=6).hexdigest()
+
+
+def _normalize_criteria(criteria: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve aliases, drop None values and lowercase substring criteria.
+
+    Unsupported criteria are ignored (and logged), as they always were.
+    """
+    normalized = {}
+    for key, value in criteria.items():
+        if value is None:
+            continue
+        key = _CRITERIA_ALIASES.get(key, key)
+        if key not in _MATCHERS:
+            logger.debug("Ignoring unsupported element criterion: %s", key)
+            continue
+        if _CRITERIA_COLUMNS[key][1] == 'contains':
+            value = value.lower()
+        normalized[key] = value
+    return normalized
+
+
 # =============================================================================
 # Data Classes
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Element:
     """Represents a UI element on screen"""
     text: str = ""
@@ -75,6 +337,15 @@ class Element:
     focusable: bool = False
     enabled: bool = True
     raw: Dict = field(default_factory=dict)
+    # Lowercase copies used by case-insensitive matching, computed once
+    _text_lower: str = field(default="", init=False, repr=False, compare=False)
+    _content_desc_lower: str = field(default="", init=False, repr=False, compare=False)
+    _element_type_lower: str = field(default="", init=False, repr=False, compare=False)
+    _identifier_lower: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for name, lowered, lower in _LOWERED_FIELDS:
+            setattr(self, lowered, lower(getattr(self, name) or ""))
 
     @property
     def center(self) -> Tuple[int, int]:
@@ -94,43 +365,105 @@ class Element:
 
     def matches(self, **criteria) -> bool:
         """Check if element matches given criteria"""
-        for key, value in criteria.items():
-            if value is None:
-                continue
-
-            if key == 'text':
-                if value.lower() not in self.text.lower():
-                    return False
-            elif key == 'text_exact':
-                if value != self.text:
-                    return False
-            elif key == 'type':
-                if value.lower() not in self.element_type.lower():
-                    return False
-            elif key == 'identifier':
-                if value.lower() not in self.identifier.lower():
-                    return False
-            elif key == 'content_desc':
-                if value.lower() not in self.content_desc.lower():
-                    return False
-            elif key == 'clickable':
-                if self.clickable != value:
-                    return False
-            elif key == 'scrollable':
-                if self.scrollable != value:
-                    return False
-        return True
-
-
-@dataclass
+        return all(_MATCHERS[key](self, value)
+                   for key, value in _normalize_criteria(criteria).items())
+
+
+class _SearchCache:
+    """Search structures of one screen, built on first use and shared with refreshed() copies"""
+
+    __slots__ = ('columns', 'joined', 'postings', 'found', 'text_index')
+
+    def __init__(self):
+        # Criterion -> per-element values (structure of arrays)
+        self.columns: Dict[str, list] = {}
+        # Substring criterion -> its column joined by _COLUMN_SEP
+        self.joined: Dict[str, str] = {}
+        # Equality criterion -> value -> ascending element indices
+        self.postings: Dict[str, Dict[Any, List[int]]] = {}
+        # Sorted find() criteria -> first matching element (or None)
+        self.found: Dict[tuple, Optional[Element]] = {}
+        # Lowercased texts and content descriptions, for exact has_text lookups
+        self.text_index: Optional[frozenset] = None
+
+
+@dataclass(init=False, **DATACLASS_SLOTS)
 class ScreenState:
-    """Represents the current screen state"""
-    elements: List[Element]
+    """Represents the current screen state
+
+    screen_hash is computed on first access unless passed in explicitly,
+    so observations that are only searched never pay for hashing.
+
+    elements is a read-only sequence: states parsed from a uiautomator dump
+    build each Element on first access. Copy it with list() to modify it.
+    """
+    elements: Sequence[Element]
     timestamp: float
-    screen_hash: str
     package: str = ""
     activity: str = ""
     raw_data: Any = None
+    # Display rotation from the uiautomator dump (0-3, quarter turns), None if unknown
+    rotation: Optional[int] = None
+    _screen_hash: Optional[str] = field(default=None, repr=False, compare=False)
+    # Include bounds in the hash (MCP element lists carry reliable bounds)
+    _hash_bounds: bool = field(default=False, repr=False, compare=False)
+    # Search columns, indexes and find() results, built on first search
+    _cache: Optional[_SearchCache] = field(default=None, repr=False, compare=False)
+
+    def __init__(self, elements: Sequence[Element], timestamp: float,
+                 screen_hash: Optional[str] = None, package: str = "",
+                 activity: str = "", raw_data: Any = None, hash_bounds: bool = False,
+                 rotation: Optional[int] = None):
+        self.elements = elements
+        self.timestamp = timestamp
+        self.package = package
+        self.activity = activity
+        self.raw_data = raw_data
+        self.rotation = rotation
+        self._screen_hash = screen_hash
+        self._hash_bounds = hash_bounds
+        self._cache = None
+
+    def refreshed(self) -> 'ScreenState':
+        """Copy with a new timestamp, sharing elements, hash and search caches"""
+        state = ScreenState(
+            elements=self.elements,
+            timestamp=time.time(),
+            screen_hash=self._screen_hash,
+            package=self.package,
+            activity=self.activity,
+            raw_data=self.raw_data,
+            hash_bounds=self._hash_bounds,
+            rotation=self.rotation
+        )
+        state._cache = self._search_cache()
+        return state
+
+    def _search_cache(self) -> _SearchCache:
+        """Get this screen's search cache, creating it on first use"""
+        if self._cache is None:
+            self._cache = _SearchCache()
+        return self._cache
+
+    @property
+    def screen_hash(self) -> str:
+        """Hash of the element tree for change detection"""
+        if self._screen_hash is None:
+            self._screen_hash = _digest(self._hash_parts())
+        return self._screen_hash
+
+    def _hash_parts(self) -> List[str]:
+        """Per-element identity strings that screen_hash is built from"""
+        if self._hash_bounds:
+            return [
+                f"{e.text}\x1f{e.element_type}\x1f{e.identifier}\x1f"
+                f"{e.bounds.get('x')},{e.bounds.get('y')},{e.bounds.get('width')},{e.bounds.get('height')}"
+                for e in self.elements
+            ]
+        if isinstance(self.elements, _LazyElements):
+            return [f"{a.get('text', '')}\x1f{a.get('class', '')}\x1f{a.get('resource-id', '')}"
+                    for a in self.elements.nodes]
+        return [f"{e.text}\x1f{e.element_type}\x1f{e.identifier}" for e in self.elements]
 
     @classmethod
     def from_elements(cls, elements: List[Dict], package: str = "", activity: str = "") -> 'ScreenState':
@@ -151,57 +484,76 @@ class ScreenState:
                 raw=el
             ))
 
-        # Generate hash for comparison
-        hash_input = json.dumps(
-            [(e.text, e.element_type, e.identifier, str(e.bounds)) for e in parsed],
-            sort_keys=True
-        )
-        screen_hash = hashlib.md5(hash_input.encode()).hexdigest()[:12]
-
         return cls(
             elements=parsed,
             timestamp=time.time(),
-            screen_hash=screen_hash,
             package=package,
             activity=activity,
-            raw_data=elements
+            raw_data=elements,
+            hash_bounds=True
         )
 
     @classmethod
-    def from_xml(cls, xml_content: str) -> 'ScreenState':
-        """Create ScreenState from uiautomator XML dump"""
-        elements = []
+    def from_xml(cls, xml_content: Union[str, bytes]) -> 'ScreenState':
+        """Create ScreenState from uiautomator XML dump (Elements are built on access)"""
+        nodes = []
+        rotation = None
+        data = xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content
         try:
-            root = ET.fromstring(xml_content)
-            for node in root.iter('node'):
-                bounds = cls._parse_bounds_string(node.get('bounds', ''))
-                elements.append(Element(
-                    text=node.get('text', ''),
-                    content_desc=node.get('content-desc', ''),
-                    element_type=node.get('class', ''),
-                    identifier=node.get('resource-id', ''),
-                    bounds=bounds,
-                    clickable=node.get('clickable') == 'true',
-                    scrollable=node.get('scrollable') == 'true',
-                    focusable=node.get('focusable') == 'true',
-                    enabled=node.get('enabled') == 'true',
-                    raw=dict(node.attrib)
-                ))
-        except ET.ParseError as e:
+            # SAX-style callbacks on start tags keep document order and build no tree
+            if LXML_AVAILABLE:
+                collector = _NodeCollector(nodes)
+                parser = etree.XMLParser(target=collector, resolve_entities=False, no_network=True)
+                parser.feed(data)
+                parser.close()
+                rotation = collector.rotation
+            else:
+                hierarchy = {}
+
+                def start_element(name, attrs):
+                    if name == 'node':
+                        nodes.append(attrs)
+                    elif name == 'hierarchy':
+                        hierarchy.update(attrs)
+
+                parser = expat.ParserCreate()
+                parser.StartElementHandler = start_element
+                parser.Parse(data, True)
+                rotation = hierarchy.get('rotation')
+        except XMLParseError as e:
             logger.error(f"XML parse error: {e}")
-
-        # Generate hash
-        hash_input = json.dumps(
-            [(e.text, e.element_type, e.identifier) for e in elements],
-            sort_keys=True
-        )
-        screen_hash = hashlib.md5(hash_input.encode()).hexdigest()[:12]
+            nodes = []
 
         return cls(
-            elements=elements,
+            elements=_LazyElements(nodes, cls._element_from_attrs),
             timestamp=time.time(),
-            screen_hash=screen_hash,
-            raw_data=xml_content
+            raw_data=xml_content,
+            rotation=int(rotation) if rotation and rotation.isdigit() else None
+        )
+
+    def reuse_elements(self, previous: Optional['ScreenState']):
+        """Reuse Elements built for an earlier dump wherever a node is unchanged"""
+        if (previous is not None and isinstance(self.elements, _LazyElements)
+                and isinstance(previous.elements, _LazyElements)):
+            self.elements.reuse_from(previous.elements)
+
+    @classmethod
+    def _element_from_attrs(cls, attrs: Dict[str, str]) -> Element:
+        """Build an Element from one uiautomator <node> attribute dict"""
+        values = _node_values(attrs)
+        text, content_desc, element_type, identifier, bounds, \
+            clickable, scrollable, focusable, enabled = values
+        return Element(
+            text=text,
+            content_desc=content_desc,
+            element_type=_intern(element_type),
+            identifier=_intern(identifier),
+            bounds=cls._parse_bounds_string(bounds),
+            clickable=clickable == 'true',
+            scrollable=scrollable == 'true',
+            focusable=focusable == 'true',
+            enabled=enabled == 'true',
+            raw=attrs
         )
 
     @staticmethod
@@ -226,29 +578,185 @@ class ScreenState:
         """Parse bounds from string format [x1,y1][x2,y2]"""
         if not bounds_str:
             return {}
-        match = re.findall(r'\[(\d+),(\d+)\]', bounds_str)
+
+        # Fast path: split the literal instead of running the regex engine
+        if bounds_str[0] == '[' and bounds_str[-1] == ']':
+            try:
+                first, second = bounds_str[1:-1].split('][')
+                x1, y1 = first.split(',')
+                x2, y2 = second.split(',')
+                if (x1 + y1 + x2 + y2).isdigit():
+                    x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+                    return {'x': x1, 'y': y1, 'width': x2-x1, 'height': y2-y1}
+            except ValueError:
+                pass
+
+        match = _BOUNDS_RE.findall(bounds_str)
         if len(match) == 2:
             x1, y1 = int(match[0][0]), int(match[0][1])
             x2, y2 = int(match[1][0]), int(match[1][1])
             return {'x': x1, 'y': y1, 'width': x2-x1, 'height': y2-y1}
         return {}
 
+    def _column(self, key: str) -> list:
+        """Get one searchable field across all elements (lowercased for substring criteria)"""
+        columns = self._search_cache().columns
+        column = columns.get(key)
+        if column is None:
+            if isinstance(self.elements, _LazyElements):
+                column = list(map(_NODE_COLUMNS[key], self.elements.nodes))
+            else:
+                attr = _CRITERIA_COLUMNS[key][0]
+                column = [getattr(e, attr) for e in self.elements]
+            columns[key] = column
+        return column
+
+    def column(self, key: str) -> list:
+        """
+        Per-element values of one search field, in element order, read without
+        building Elements: 'text_exact' is the raw text, 'text', 'type',
+        'identifier' and 'content_desc' are lowercased, 'clickable' and
+        'scrollable' are bools. Cached per screen, so treat it as read-only.
+
+        Raises:
+            ValueError: If the field is not a search criterion
+        """
+        key = _CRITERIA_ALIASES.get(key, key)
+        if key not in _CRITERIA_COLUMNS:
+            raise ValueError(f"Unknown element criterion: {key}. Available: {sorted(_CRITERIA_COLUMNS)}")
+        return self._column(key)
+
+    def _joined_column(self, key: str) -> str:
+        """Get a substring column joined into one string, so str.find can scan it in C"""
+        cache = self._search_cache()
+        joined = cache.joined.get(key)
+        if joined is None:
+            joined = cache.joined[key] = _COLUMN_SEP.join(self._column(key))
+        return joined
+
+    def _scan(self, key: str, value: str):
+        """Yield indices of elements whose substring column contains value"""
+        joined = self._joined_column(key)
+        index, last = 0, 0
+        pos = joined.find(value)
+        while pos >= 0:
+            index += joined.count(_COLUMN_SEP, last, pos)
+            yield index
+            # Resume at the next element; `last` is this element's trailing separator
+            last = joined.find(_COLUMN_SEP, pos)
+            if last < 0:
+                return
+            pos = joined.find(value, last + 1)
+
+    @staticmethod
+    def _split_driver(criteria: Dict[str, Any]) -> Tuple[Optional[str], Any, Dict[str, Any]]:
+        """Pick a substring criterion to drive the scan, return (key, value, remaining criteria)"""
+        for key, value in criteria.items():
+            if _CRITERIA_COLUMNS[key][1] == 'contains':
+                rest = dict(criteria)
+                del rest[key]
+                return key, value, rest
+        return None, None, criteria
+
+    def _postings(self, key: str) -> Dict[Any, List[int]]:
+        """Get value -> ascending element indices for an equality column"""
+        cache = self._search_cache()
+        postings = cache.postings.get(key)
+        if postings is None:
+            postings = cache.postings[key] = {}
+            for i, value in enumerate(self._column(key)):
+                postings.setdefault(value, []).append(i)
+        return postings
+
+    def _match_indices(self, criteria: Dict[str, Any]) -> List[int]:
+        """Indices of elements matching normalized criteria, same semantics as Element.matches"""
+        driver, driver_value, rest = self._split_driver(criteria)
+        start = None
+        if driver:
+            indices = list(self._scan(driver, driver_value))
+        elif rest:
+            # Only equality criteria: start from the shortest posting list
+            start = min((self._postings(key).get(value, []) for key, value in rest.items()), key=len)
+            indices = list(start)
+        else:
+            indices = list(range(len(self.elements)))
+
+        for key, value in rest.items():
+            if not indices:
+                return []
+            if _CRITERIA_COLUMNS[key][1] == 'contains':
+                column = self._column(key)
+                indices = [i for i in indices if value in column[i]]
+            else:
+                positions = self._postings(key).get(value, ())
+                if positions is not start:
+                    positions = set(positions)
+                    indices = [i for i in indices if i in positions]
+        return indices
+
     def find(self, **criteria) -> Optional[Element]:
-        """Find first element matching criteria"""
-        for el in self.elements:
-            if el.matches(**criteria):
-                return el
+        """Find first element matching criteria (memoized per screen)"""
+        criteria = _normalize_criteria(criteria)
+        key = tuple(sorted(criteria.items()))
+        # Shared with refreshed() copies, so polling an unchanged screen hits it too
+        found = self._search_cache().found
+        if key not in found:
+            found[key] = self._find_first(criteria)
+        return found[key]
+
+    def _find_first(self, criteria: Dict[str, Any]) -> Optional[Element]:
+        """First element matching normalized criteria"""
+        driver, driver_value, rest = self._split_driver(criteria)
+        if not driver:
+            indices = self._match_indices(criteria)
+            return self.elements[indices[0]] if indices else None
+
+        # Stop at the first hit instead of collecting every match
+        checks = [(self._column(key), _CRITERIA_COLUMNS[key][1] == 'contains', value)
+                  for key, value in rest.items()]
+        for i in self._scan(driver, driver_value):
+            if all((value in column[i]) if contains else (column[i] == value)
+                   for column, contains, value in checks):
+                return self.elements[i]
+        return None
+
+    def find_any_text(self, texts: List[str]) -> Optional[Element]:
+        """
+        First element whose text contains texts[0] (case-insensitive), else
+        texts[1], and so on: alternatives are tried in priority order, each
+        a memoized find() scan over the joined text column.
+        """
+        for text in texts:
+            element = self.find(text=text)
+            if element is not None:
+                return element
         return None
 
     def find_all(self, **criteria) -> List[Element]:
         """Find all elements matching criteria"""
-        return [el for el in self.elements if el.matches(**criteria)]
+        return [self.elements[i] for i in self._match_indices(_normalize_criteria(criteria))]
+
+    def count(self, **criteria) -> int:
+        """Count elements matching criteria without building them"""
+        return len(self._match_indices(_normalize_criteria(criteria)))
 
     def has_text(self, text: str) -> bool:
         """Check if any element contains the text"""
+        if not self.elements:
+            return False
         text_lower = text.lower()
-        return any(text_lower in e.text.lower() or text_lower in e.content_desc.lower()
-                   for e in self.elements)
+        if text_lower in self._text_index():
+            return True
+        # Substring fallback runs in C over the joined columns
+        return (text_lower in self._joined_column('text')
+                or text_lower in self._joined_column('content_desc'))
+
+    def _text_index(self) -> frozenset:
+        """Get the set of lowercased texts and content descriptions for exact lookups"""
+        cache = self._search_cache()
+        if cache.text_index is None:
+            cache.text_index = frozenset(self._column('text') + self._column('content_desc'))
+        return cache.text_index
 
 
 class ActionResult(Enum):
@@ -260,7 +768,7 @@ class ActionResult(Enum):
     ERROR = "error"               # Action failed with error
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ExecutionResult:
     """Result of an execution"""
     result: ActionResult
@@ -286,7 +794,7 @@ class DeterministicExecutor:
 
     def __init__(self, device_id: str = None, max_retries: int = 3,
                  verify_timeout: float = 3.0, action_delay: float = 0.5,
-                 save_debug_on_failure: bool = True):
+                 save_debug_on_failure: bool = True, compressed_dumps: bool = False):
         """
         Initialize executor.
 
@@ -296,6 +804,9 @@ class DeterministicExecutor:
             verify_timeout: Timeout for verification (seconds)
             action_delay: Delay between action and verification (seconds)
             save_debug_on_failure: Save screenshot + element dump on action failure
+            compressed_dumps: Observe with `uiautomator dump --compressed`, which drops
+                layout-only nodes (often half the tree); off by default because
+                heuristics keyed on container views may then miss them
         """
         self.adb = ADBHelper(device_id)
         self.device_id = device_id or self.adb.device_id
@@ -303,10 +814,20 @@ class DeterministicExecutor:
         self.verify_timeout = verify_timeout
         self.action_delay = action_delay
         self.save_debug_on_failure = save_debug_on_failure
+        self.compressed_dumps = compressed_dumps
 
         self.last_state: Optional[ScreenState] = None
-        self.state_history: List[ScreenState] = []
+        # Set by input actions; last_state may no longer match the screen
+        self._state_stale = True
+        # Bounded ring of recent states; entries share elements with last_state
+        self.state_history: Deque[ScreenState] = deque(maxlen=STATE_HISTORY_SIZE)
         self._mcp_callback: Optional[Callable] = None
+        self._u2 = None
+        self._exec_out_dump = True
+        # Pulled dumps go to the system temp dir (often tmpfs), one file per device
+        device_tag = re.sub(r'[^\w.-]', '_', self.device_id or "default")
+        self._local_dump_path = os.path.join(tempfile.gettempdir(), f"window_dump_{device_tag}.xml")
+        self._last_dump: Tuple[Optional[str], Optional[ScreenState]] = (None, None)
 
         # Debug artifacts directory
         self.debug_dir = os.path.join(PROJECT_ROOT, "temp", "debug")
@@ -326,11 +847,23 @@ class DeterministicExecutor:
         """
         self._mcp_callback = callback
 
+    def set_u2_driver(self, driver):
+        """
+        Set uiautomator2 driver for hierarchy dumps.
+
+        The u2 server stays up behind a forwarded port, so each observation
+        is one local HTTP call instead of `uiautomator dump` + `adb pull`.
+
+        Args:
+            driver: Connected U2Driver (None to disable)
+        """
+        self._u2 = driver
+
     # =========================================================================
     # Observation Methods
     # =========================================================================
 
-    def observe(self, use_mcp: bool = True) -> ScreenState:
+    def observe(self, use_mcp: bool = True, max_age: float = 0) -> ScreenState:
         """
         Get current screen state via element tree.
 
@@ -338,10 +871,19 @@ class DeterministicExecutor:
 
         Args:
             use_mcp: Whether to try MCP callback first
+            max_age: Reuse last_state if it is at most this many seconds old
+                and no input action has been issued since (0 = always dump)
 
         Returns:
             ScreenState with all visible elements
         """
+        last = self.last_state
+        if (max_age > 0 and last is not None and not self._state_stale
+                and time.time() - last.timestamp <= max_age):
+            logger.debug("Reusing screen state observed %.0fms ago",
+                         (time.time() - last.timestamp) * 1000)
+            return last
+
         logger.debug("Observing screen state...")
 
         # Try MCP callback first (if available)
@@ -349,57 +891,168 @@ class DeterministicExecutor:
             try:
                 elements = self._mcp_callback()
                 if elements:
-                    state = ScreenState.from_elements(elements)
+                    state = self._reuse_if_unchanged(elements) or ScreenState.from_elements(elements)
                     self._update_state(state)
-                    logger.debug(f"Observed {len(state.elements)} elements via MCP")
+                    logger.debug("Observed %d elements via MCP", len(state.elements))
                     return state
             except Exception as e:
                 logger.warning(f"MCP callback failed: {e}, falling back to ADB")
 
+        # Next: uiautomator2 server (no on-device file, no pull)
+        if self._u2:
+            state = self._observe_via_u2()
+            if state is not None:
+                self._update_state(state)
+                return state
+
         # Fallback: uiautomator dump
         state = self._observe_via_uiautomator()
         self._update_state(state)
         return state
 
+    def observe_compact(self) -> ScreenState:
+        """
+        Get a compressed dump of the focused window for quick lookups.
+
+        Layout-only nodes are left out, so the tree is several times smaller
+        to transfer and parse. The state is not recorded as last_state: its
+        hash is not comparable with the full dumps used for verification.
+        """
+        if self._mcp_callback or not (self._u2 or self._exec_out_dump):
+            return self.observe()
+
+        xml_content = None
+        if self._u2:
+            xml_content = self._u2.dump_hierarchy(compressed=True)
+        if not xml_content and self._exec_out_dump:
+            _, xml_content = self._dump_via_exec_out(compressed=True)
+        if not xml_content:
+            return self.observe()
+
+        state = ScreenState.from_xml(xml_content)
+        logger.debug("Observed %d elements via compressed dump", len(state.elements))
+        return state
+
+    def _observe_via_u2(self) -> Optional[ScreenState]:
+        """Get screen state via the uiautomator2 server, None if unavailable"""
+        xml_content = self._u2.dump_hierarchy(compressed=self.compressed_dumps)
+        if not xml_content:
+            logger.warning("u2 hierarchy dump failed, falling back to uiautomator dump")
+            return None
+
+        state = self._state_from_dump(xml_content)
+        logger.debug("Observed %d elements via uiautomator2", len(state.elements))
+        return state
+
     def _observe_via_uiautomator(self) -> ScreenState:
         """Get screen state via uiautomator dump (ADB fallback)"""
-        dump_path = "/sdcard/window_dump.xml"
-        local_path = os.path.join(PROJECT_ROOT, "temp", "window_dump.xml")
+        # One adb round trip: the dump streams to stdout, no file on either side
+        if self._exec_out_dump:
+            ok, xml_content = self._dump_via_exec_out(self.compressed_dumps)
+            if xml_content is not None:
+                state = self._state_from_dump(xml_content)
+                logger.debug("Observed %d elements via uiautomator exec-out", len(state.elements))
+                return state
+            if ok:
+                # The device answered without a hierarchy: it can't dump to /dev/tty
+                logger.debug("exec-out dump unsupported, using dump + pull from now on")
+                self._exec_out_dump = False
 
-        # Dump UI hierarchy
-        args = ["shell", "uiautomator", "dump", dump_path]
-        if self.device_id:
-            args = ["-s", self.device_id] + args
+        dump_path = "/sdcard/window_dump.xml"
+        local_path = self._local_dump_path
 
-        ok, output = run_adb(args)
+        # Dump UI hierarchy and checksum it on the device, over the persistent shell
+        dump_args = ["uiautomator", "dump"] + (["--compressed"] if self.compressed_dumps else [])
+        ok, output = run_adb_shell(dump_args + [dump_path,
+                                                "&&", "(md5sum", dump_path, "2>/dev/null", "||", "true)"],
+                                   self.device_id)
         if not ok:
             logger.error(f"uiautomator dump failed: {output}")
             return ScreenState(elements=[], timestamp=time.time(), screen_hash="error")
 
+        # Same bytes as the last pull: skip the transfer and the parse
+        digest = self._parse_md5(output)
+        last_md5, last_dump_state = self._last_dump
+        if digest and digest == last_md5 and last_dump_state.elements:
+            logger.debug("Dump checksum unchanged, skipping pull")
+            return last_dump_state.refreshed()
+
         # Pull dump file
         pull_args = ["pull", dump_path, local_path]
         if self.device_id:
             pull_args = ["-s", self.device_id] + pull_args
         ok, _ = run_adb(pull_args)
-        if not ok or not os.path.exists(local_path):
+        if not ok:
             logger.error("Failed to pull dump file")
             return ScreenState(elements=[], timestamp=time.time(), screen_hash="error")
 
-        # Parse XML
-        with open(local_path, 'r', encoding='utf-8') as f:
-            xml_content = f.read()
+        # Parse XML straight from bytes (the parsers decode it themselves)
+        try:
+            with open(local_path, 'rb') as f:
+                xml_content = f.read()
+        except OSError as e:
+            logger.error(f"Failed to read dump file: {e}")
+            return ScreenState(elements=[], timestamp=time.time(), screen_hash="error")
 
-        state = ScreenState.from_xml(xml_content)
-        logger.debug(f"Observed {len(state.elements)} elements via uiautomator")
+        state = self._state_from_dump(xml_content)
+        self._last_dump = (digest, state)
+        logger.debug("Observed %d elements via uiautomator", len(state.elements))
         return state
 
+    @staticmethod
+    def _parse_md5(output: str) -> Optional[str]:
+        """Extract the checksum from md5sum output, None if md5sum is unavailable"""
+        lines = output.splitlines()
+        digest = lines[-1].split(None, 1)[0] if lines and lines[-1].strip() else ""
+        if len(digest) == 32 and all(c in string.hexdigits for c in digest):
+            return digest
+        return None
+
+    def _dump_via_exec_out(self, compressed: bool = False) -> Tuple[bool, Optional[bytes]]:
+        """Stream the uiautomator dump over exec-out, return (adb ok, xml or None)"""
+        args = ["exec-out", "uiautomator", "dump"] + (["--compressed"] if compressed else []) + ["/dev/tty"]
+        if self.device_id:
+            args = ["-s", self.device_id] + args
+
+        ok, output = run_adb_raw(args)
+        # Drop the trailing "UI hierchary dumped to: /dev/tty" banner
+        end = output.rfind(b"</hierarchy>") if ok else -1
+        if end < 0:
+            return ok, None
+        return ok, output[:end + len(b"</hierarchy>")]
+
+    def _state_from_dump(self, xml_content: Union[str, bytes]) -> ScreenState:
+        """Parse a dump, reusing last_state if identical or else its unchanged Elements"""
+        state = self._reuse_if_unchanged(xml_content)
+        if state is None:
+            state = ScreenState.from_xml(xml_content)
+            state.reuse_elements(self.last_state)
+        return state
+
+    def _reuse_if_unchanged(self, raw: Any) -> Optional[ScreenState]:
+        """
+        Skip re-parsing when the raw dump equals the one behind last_state.
+
+        Verify and wait loops re-observe an unchanged screen many times; a
+        direct compare of the retained raw data is far cheaper than a parse.
+        """
+        last = self.last_state
+        if last is None or not last.elements or last.raw_data is raw:
+            return None
+        if type(last.raw_data) is not type(raw) or last.raw_data != raw:
+            return None
+        logger.debug("Screen dump unchanged, reusing last state")
+        return last.refreshed()
+
     def _update_state(self, state: ScreenState):
         """Update state tracking"""
         self.last_state = state
+        self._state_stale = False
         self.state_history.append(state)
-        # Keep only last 20 states
-        if len(self.state_history) > 20:
-            self.state_history = self.state_history[-20:]
+
+    def invalidate(self):
+        """Mark last_state stale after an input action so observe() dumps again"""
+        self._state_stale = True
 
     def _save_debug_artifacts(self, action: str, error_msg: str,
                                state: ScreenState = None, target: Any = None):
@@ -421,20 +1074,21 @@ class DeterministicExecutor:
             return
 
         try:
-            # Create timestamped directory
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            artifact_dir = os.path.join(self.debug_dir, f"{timestamp}_{action}_failed")
+            # Run id + process-wide counter: unique even for sub-second failures
+            artifact_dir = os.path.join(self.debug_dir,
+                                        f"{RUN_ID}_{next(_artifact_counter):04d}_{action}_failed")
             os.makedirs(artifact_dir, exist_ok=True)
 
-            # Save screenshot
+            if state is None:
+                state = self.last_state
+
+            # Save screenshot (copied from the last capture if the UI hash is unchanged)
             screenshot_path = os.path.join(artifact_dir, "screenshot.png")
-            self.adb.screenshot(screenshot_path)
+            screen_hash = state.screen_hash if state and state.elements else None
+            self.adb.screenshot_if_changed(screen_hash, screenshot_path)
 
             # Save elements
             elements_path = os.path.join(artifact_dir, "elements.json")
-            if state is None:
-                state = self.last_state
             if state:
                 elements_data = []
                 for el in state.elements:
@@ -448,8 +1102,7 @@ class DeterministicExecutor:
                         "clickable": el.clickable,
                         "scrollable": el.scrollable,
                     })
-                with open(elements_path, 'w', encoding='utf-8') as f:
-                    json.dump(elements_data, f, ensure_ascii=False, indent=2)
+                write_json(elements_path, elements_data)
 
             # Save info
             info_path = os.path.join(artifact_dir, "info.json")
@@ -466,7 +1119,8 @@ class DeterministicExecutor:
                     target_info = {"type": "coordinates", "x": target[0], "y": target[1]}
 
             info_data = {
-                "timestamp": timestamp,
+                "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+                "run_id": RUN_ID,
                 "action": action,
                 "error": error_msg,
                 "device_id": self.device_id,
@@ -474,8 +1128,7 @@ class DeterministicExecutor:
                 "screen_hash": state.screen_hash if state else None,
                 "element_count": len(state.elements) if state else 0,
             }
-            with open(info_path, 'w', encoding='utf-8') as f:
-                json.dump(info_data, f, ensure_ascii=False, indent=2)
+            write_json(info_path, info_data)
 
             logger.info(f"Debug artifacts saved: {artifact_dir}")
 
@@ -566,6 +1219,7 @@ class DeterministicExecutor:
 
         # Execute click
         ok, msg = tap(x, y, self.device_id)
+        self.invalidate()
         if not ok:
             self._save_debug_artifacts("click", f"tap failed: {msg}",
                                         before_state, target)
@@ -623,6 +1277,7 @@ class DeterministicExecutor:
             x, y = target
 
         ok, msg = tap(x, y, self.device_id)
+        self.invalidate()
         if ok:
             time.sleep(self.action_delay)
             self.observe()
@@ -645,7 +1300,7 @@ class DeterministicExecutor:
         start_time = time.time()
 
         # Get screen size
-        w, h = self.adb.get_screen_size()
+        w, h = self._get_screen_size()
         if not w or not h:
             return ExecutionResult(
                 result=ActionResult.ERROR,
@@ -685,6 +1340,7 @@ class DeterministicExecutor:
         # Execute swipe
         logger.info(f"Swipe {direction}: ({x1},{y1}) -> ({x2},{y2})")
         ok, msg = swipe(x1, y1, x2, y2, 300, self.device_id)
+        self.invalidate()
         if not ok:
             self._save_debug_artifacts("swipe", f"swipe {direction} failed: {msg}",
                                         before_state, (x1, y1))
@@ -695,22 +1351,35 @@ class DeterministicExecutor:
                 duration=time.time() - start_time
             )
 
-        # Wait and verify
-        time.sleep(self.action_delay + 0.5)  # Extra wait for scroll animation
-
-        for attempt in range(self.max_retries):
+        # Poll from a short settle instead of sleeping through the whole animation:
+        # once the hash has moved off before_hash, take one more dump so the
+        # scroll can finish, then return. Animated feeds (video, tickers) never
+        # repeat exactly, so waiting for a stable screen is left to callers
+        # that ask for it via wait_for_screen_settle.
+        time.sleep(SWIPE_SETTLE_TIME)
+        # Same overall budget as the old fixed wait plus 0.5s, 1.0s, ... retry backoff
+        deadline = (time.time() + self.action_delay + 0.5
+                    + 0.25 * self.max_retries * (self.max_retries + 1))
+        changed = None
+        while True:
             after_state = self.observe()
-
             if after_state.screen_hash != before_hash:
-                return ExecutionResult(
-                    result=ActionResult.SUCCESS,
-                    before_state=before_state,
-                    after_state=after_state,
-                    message="Swipe verified",
-                    duration=time.time() - start_time
-                )
-
-            time.sleep(0.5 * (attempt + 1))
+                extra_poll_done = changed is not None
+                changed = after_state
+                if extra_poll_done:
+                    break
+            if time.time() >= deadline:
+                break
+            time.sleep(SWIPE_POLL_INTERVAL)
+
+        if changed is not None:
+            return ExecutionResult(
+                result=ActionResult.SUCCESS,
+                before_state=before_state,
+                after_state=changed,
+                message="Swipe verified",
+                duration=time.time() - start_time
+            )
 
         # Content might not have changed (end of list)
         return ExecutionResult(
@@ -737,6 +1406,7 @@ class DeterministicExecutor:
 
         # Press back
         ok, msg = press_back(self.device_id)
+        self.invalidate()
         if not ok:
             self._save_debug_artifacts("back", f"press_back failed: {msg}",
                                         before_state)
@@ -795,17 +1465,46 @@ class DeterministicExecutor:
         timeout = timeout or self.verify_timeout
         start = time.time()
 
-        while time.time() - start < timeout:
+        # Let the device block until the element exists: one RPC instead of N dumps.
+        # If the wait itself fails, fall back to polling dumps.
+        selector = self._u2_selector(criteria)
+        if selector is not None:
+            exists = self._u2.wait_exists(timeout=timeout, **selector)
+            if exists is False:
+                logger.debug("Element not found on device within %ss: %s", timeout, criteria)
+                return False, None
+
+        # Always look at least once, even if the device wait used up the timeout
+        while True:
             state = self.observe()
             element = state.find(**criteria)
             if element:
-                logger.debug(f"Found element matching {criteria}")
+                logger.debug("Found element matching %s", criteria)
                 return True, element
+            if time.time() - start >= timeout:
+                break
             time.sleep(0.5)
 
-        logger.debug(f"Element not found within {timeout}s: {criteria}")
+        logger.debug("Element not found within %ss: %s", timeout, criteria)
         return False, None
 
+    def _u2_selector(self, criteria: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Translate element criteria to a uiautomator2 selector, None if u2 is unavailable"""
+        if not self._u2 or not self._u2.connected:
+            return None
+
+        selector = {}
+        for key, value in _normalize_criteria(criteria).items():
+            u2_key, kind = _U2_SELECTOR_KEYS[key]
+            if kind == 'contains':
+                # Case-insensitive literal substring, like the local search
+                if '\\E' in value:
+                    return None
+                selector[u2_key] = f"(?isu).*\\Q{value}\\E.*"
+            else:
+                selector[u2_key] = value
+        return selector or None
+
     def wait_for_text(self, text: str, timeout: float = None) -> bool:
         """Wait for text to appear on screen"""
         found, _ = self.wait_for_element(timeout, text=text)
@@ -828,10 +1527,71 @@ class DeterministicExecutor:
 
         return False
 
+    def wait_for_screen_settle(self, timeout: float = None) -> bool:
+        """
+        Wait until two consecutive dumps share a hash (e.g. a scroll has stopped).
+
+        Args:
+            timeout: Maximum wait (verify_timeout if None)
+
+        Returns:
+            True if the screen settled before the timeout
+        """
+        timeout = timeout or self.verify_timeout
+        deadline = time.time() + timeout
+        previous_hash = self.observe().screen_hash
+
+        while time.time() < deadline:
+            time.sleep(SWIPE_POLL_INTERVAL)
+            current_hash = self.observe().screen_hash
+            if current_hash == previous_hash:
+                return True
+            previous_hash = current_hash
+
+        return False
+
+    def wait_until(self, predicate: Callable[[ScreenState], bool],
+                   timeout: float = None,
+                   poll: float = WAIT_POLL_INTERVAL) -> Tuple[bool, ScreenState]:
+        """
+        Poll the screen until predicate(state) holds, instead of a fixed sleep.
+
+        Args:
+            predicate: Condition on the observed ScreenState
+            timeout: Maximum wait (verify_timeout if None)
+            poll: Gap between observations
+
+        Returns:
+            (matched, last observed state) tuple
+        """
+        timeout = timeout or self.verify_timeout
+        deadline = time.time() + timeout
+
+        while True:
+            state = self.observe()
+            if predicate(state):
+                return True, state
+            if time.time() >= deadline:
+                return False, state
+            time.sleep(poll)
+
     # =========================================================================
     # Utility Methods
     # =========================================================================
 
+    def _get_screen_size(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Screen size in the current orientation.
+
+        The physical size is queried once per device (cached in adb_helper);
+        the rotation of the latest dump decides whether width and height swap.
+        """
+        w, h = self.adb.get_screen_size()
+        rotation = self.last_state.rotation if self.last_state else None
+        if w and h and rotation in (1, 3):
+            return h, w
+        return w, h
+
     def get_screen_text(self) -> List[str]:
         """Get all visible text on screen"""
         state = self.last_state or self.observe()
@@ -850,7 +1610,7 @@ class DeterministicExecutor:
 
     def clear_history(self):
         """Clear state history"""
-        self.state_history = []
+        self.state_history.clear()
         self.last_state = None
 
 
@@ -8,7 +8,10 @@ Usage:
     logger.info("message")
 """
 import logging
+import logging.handlers
+import atexit
 import os
+import queue
 import sys
 from datetime import datetime
 
@@ -19,8 +22,31 @@ os.makedirs(LOG_DIR, exist_ok=True)
 # Daily log file
 LOG_FILE = os.path.join(LOG_DIR, f"mobile_agent_{datetime.now():%Y%m%d}.log")
 
+# Format: time | level | module | message
+_formatter = logging.Formatter(
+    "%(asctime)s | %(levelname)-5s | %(name)s | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
 
-# Get logger instance
+# File handler (DEBUG+), written from a background thread so callers never block on disk I/O
+_fileHandler = logging.FileHandler(LOG_FILE, encoding="utf-8")
+_fileHandler.setLevel(logging.DEBUG)
+_fileHandler.setFormatter(_formatter)
+
+_logQueue = queue.SimpleQueue()
+_queueHandler = logging.handlers.QueueHandler(_logQueue)
+_queueHandler.setLevel(logging.DEBUG)
+_listener = logging.handlers.QueueListener(_logQueue, _fileHandler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
+# Console handler (INFO+), synchronous so output stays in order with print()
+_consoleHandler = logging.StreamHandler(sys.stdout)
+_consoleHandler.setLevel(logging.INFO)
+_consoleHandler.setFormatter(_formatter)
+
+
+# Get logger instance (every logger shares the same two handlers and one log file descriptor)
 def get_logger(name):
     logger = logging.getLogger(name)
 
@@ -29,24 +55,8 @@ def get_logger(name):
         return logger
 
     logger.setLevel(logging.DEBUG)
-
-    # Format: time | level | module | message
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)-5s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-
-    # File handler (DEBUG+)
-    fileHandler = logging.FileHandler(LOG_FILE, encoding="utf-8")
-    fileHandler.setLevel(logging.DEBUG)
-    fileHandler.setFormatter(formatter)
-    logger.addHandler(fileHandler)
-
-    # Console handler (INFO+)
-    consoleHandler = logging.StreamHandler(sys.stdout)
-    consoleHandler.setLevel(logging.INFO)
-    consoleHandler.setFormatter(formatter)
-    logger.addHandler(consoleHandler)
+    logger.addHandler(_queueHandler)
+    logger.addHandler(_consoleHandler)
 
     return logger
 
@@ -31,8 +31,12 @@ MCP Configuration:
 import os
 import sys
 import json
+import time
+import random
 import asyncio
-from typing import Optional, Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, Dict, List, Any, Callable
 
 # Setup paths
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -53,14 +57,24 @@ except ImportError:
     MCP_AVAILABLE = False
     logger.warning("MCP SDK not installed. Run: pip install mcp")
 
+# orjson encodes tool results in C; json module otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 # Import our modules
 from tool_router import ToolRouter
 from executor import DeterministicExecutor, ActionResult
 from state_tracker import StateTracker
+from patrol import PatrolStateMachine, PatrolConfig
 
 # Global instances (initialized on first use)
 _router: Optional[ToolRouter] = None
 _executor: Optional[DeterministicExecutor] = None
+_patrol_machines: Dict[str, PatrolStateMachine] = {}
 
 
 def get_router() -> ToolRouter:
@@ -72,13 +86,56 @@ def get_router() -> ToolRouter:
 
 
 def get_executor() -> DeterministicExecutor:
-    """Get or create DeterministicExecutor instance"""
+    """Get the router's DeterministicExecutor (one device connection, one screen state)"""
     global _executor
     if _executor is None:
-        _executor = DeterministicExecutor()
+        _executor = get_router().executor
     return _executor
 
 
+# Worker for device queries that can overlap with an observation
+_io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="macro-io")
+
+# get_screen_summary response limits
+SUMMARY_MAX_TEXTS = 20
+SUMMARY_MAX_BUTTONS = 15
+
+# Retry backoff: full jitter, delay drawn from [0, min(cap, base * 2^attempt)]
+BACKOFF_BASE = 0.25
+BACKOFF_CAP = 2.0
+_backoff_random = random.Random()
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt + 1"""
+    return _backoff_random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _build_selector(
+    text: str = None,
+    resource_id: str = None,
+    description: str = None,
+    class_name: str = None,
+    exact_text: bool = False
+) -> Dict[str, str]:
+    """u2 selector from the given criteria (text is a contains match unless exact_text)"""
+    return {
+        key: value for key, value in (
+            ('text' if exact_text else 'textContains', text),
+            ('resourceId', resource_id),
+            ('descriptionContains', description),
+            ('className', class_name),
+        ) if value
+    }
+
+
+def _to_json(result: Dict[str, Any]) -> str:
+    """Compact JSON for tool responses (read by the client, not by people)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(result).decode("utf-8")
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
 # =============================================================================
 # Macro Tool Implementations
 # =============================================================================
@@ -111,19 +168,12 @@ def find_and_click(
     """
     router = get_router()
 
+    # u2 selector, built once and reused across attempts
+    selector = _build_selector(text, resource_id, description, class_name)
+
     for attempt in range(retry + 1):
         # Try U2 selector-based click first (most reliable)
         if router.u2_available:
-            selector = {}
-            if text:
-                selector['textContains'] = text
-            if resource_id:
-                selector['resourceId'] = resource_id
-            if description:
-                selector['descriptionContains'] = description
-            if class_name:
-                selector['className'] = class_name
-
             if selector:
                 ok, msg = router.click_by_selector(timeout=timeout, **selector)
                 if ok:
@@ -133,12 +183,14 @@ def find_and_click(
                         "method": "u2_selector"
                     }
 
-        # Fallback to coordinate-based click
+        # Fallback to coordinate-based click; skip the router's own u2 attempt
+        # when the selector click above already waited on the device
         ok, msg = router.click(
             text=text,
             identifier=resource_id,
             element_type=class_name,
-            verify=verify
+            verify=verify,
+            use_u2=False if selector and router.u2_available else None
         )
 
         if ok:
@@ -149,9 +201,10 @@ def find_and_click(
             }
 
         if attempt < retry:
-            logger.debug(f"Retry {attempt + 1}/{retry}: {msg}")
-            import time
-            time.sleep(0.5)
+            logger.debug("Retry %d/%d: %s", attempt + 1, retry, msg)
+            # The u2 selector click already waited up to `timeout` on the device
+            if not router.u2_available:
+                time.sleep(_backoff_delay(attempt))
 
     return {
         "success": False,
@@ -185,17 +238,12 @@ def type_and_submit(
         {"success": bool, "message": str}
     """
     router = get_router()
-    import time
 
     # Find and click input field if specified
     if input_text or input_id:
         if router.u2_available:
-            selector = {}
-            if input_id:
-                selector['resourceId'] = input_id
-            elif input_text:
-                selector['textContains'] = input_text
-
+            # Resource ID takes precedence over the field text
+            selector = _build_selector(text=None if input_id else input_text, resource_id=input_id)
             ok, msg = router.type_into_element(text, clear_first=clear_first, **selector)
             if ok:
                 if submit:
@@ -236,19 +284,12 @@ def smart_wait(
     """
     router = get_router()
 
-    selector = {}
-    if text:
-        selector['textContains'] = text
-    if resource_id:
-        selector['resourceId'] = resource_id
-
+    selector = _build_selector(text, resource_id)
     if not selector:
         return {"success": False, "found": False, "message": "No selector provided"}
 
-    if router.u2_available:
-        found, element = router.wait_for_element_u2(timeout=timeout, gone=gone, **selector)
-    else:
-        found, element = router.wait_for_element(timeout=timeout, **selector)
+    # Device-side wait with u2; the router falls back to observe-based polling without it
+    found, element = router.wait_for_element_u2(timeout=timeout, gone=gone, **selector)
 
     action = "disappeared" if gone else "appeared"
     if found:
@@ -285,11 +326,7 @@ def scroll_and_find(
     """
     router = get_router()
 
-    selector = {}
-    if text:
-        selector['text'] = text
-    if resource_id:
-        selector['resourceId'] = resource_id
+    selector = _build_selector(text, resource_id, exact_text=True)
 
     if router.u2_available:
         found, element = router.scroll_to_element(
@@ -304,21 +341,29 @@ def scroll_and_find(
                 "element": {"text": element.text if element else text}
             }
     else:
-        # Fallback: manual scroll loop
-        for i in range(max_scrolls):
-            if router.has_text(text or ""):
+        # Fallback: manual scroll loop. Poll the hash until the list settles
+        # (capped at 0.8s) and check the settled screen left as last state
+        executor = get_executor()
+        checked = {}  # screen_hash -> has_text result; a swipe that hit the end repeats a screen
+
+        def visible(state) -> bool:
+            key = state.screen_hash
+            if key not in checked:
+                checked[key] = state.has_text(text or "")
+            return checked[key]
+
+        state = router.get_screen_state()
+        for i in range(max_scrolls + 1):
+            if visible(state):
                 return {
                     "success": True,
                     "scrolls": i,
                     "message": f"Found after {i} scrolls"
                 }
-            router.swipe(direction, verify=False)
-            import time
-            time.sleep(0.8)
-
-        # Final check
-        if router.has_text(text or ""):
-            return {"success": True, "scrolls": max_scrolls, "message": "Found"}
+            if i < max_scrolls:
+                router.swipe(direction, verify=False)
+                executor.wait_for_screen_settle(timeout=0.8)
+                state = executor.last_state or router.get_screen_state()
 
     return {
         "success": False,
@@ -329,7 +374,8 @@ def scroll_and_find(
 
 def navigate_back(
     expected_text: str = None,
-    max_attempts: int = 3
+    max_attempts: int = 3,
+    verify: bool = True
 ) -> Dict[str, Any]:
     """
     Press back and verify navigation.
@@ -337,13 +383,22 @@ def navigate_back(
     Args:
         expected_text: Text expected on previous screen
         max_attempts: Maximum back press attempts
+        verify: Verify the screen changed (ignored when expected_text is given)
 
     Returns:
         {"success": bool, "attempts": int, "message": str}
     """
     router = get_router()
     executor = get_executor()
-    import time
+
+    # Nothing to check: one back press, no screen dumps
+    if not verify and not expected_text:
+        ok, msg = router.back(verify=False)
+        return {
+            "success": ok,
+            "attempts": 1,
+            "message": "Back pressed (unverified)" if ok else msg
+        }
 
     for attempt in range(max_attempts):
         result = executor.back_and_verify(expected_text)
@@ -362,7 +417,8 @@ def navigate_back(
                 "message": f"Found expected text: {expected_text}"
             }
 
-        time.sleep(0.5)
+        if attempt < max_attempts - 1:
+            time.sleep(_backoff_delay(attempt))
 
     return {
         "success": False,
@@ -371,16 +427,37 @@ def navigate_back(
     }
 
 
+# Common dismiss buttons, in the order they are preferred
+POPUP_BUTTONS = [
+    "OK", "Cancel", "Close", "Dismiss", "Got it", "Not now",
+    "Skip", "Later", "No thanks", "Allow", "Deny",
+    "確定", "取消", "關閉", "略過", "稍後", "允許", "拒絕"
+]
+
+
+def _find_popup_button(router: ToolRouter, button_texts: List[str]):
+    """First button (in button_texts order) on a fresh screen dump, None if absent"""
+    state = router.get_screen_state()
+    for btn_text in button_texts:
+        element = state.find(text_exact=btn_text)
+        if element:
+            return element
+    return None
+
+
 def dismiss_popup(
     button_texts: List[str] = None,
-    timeout: float = 2.0
+    timeout: float = 0.5
 ) -> Dict[str, Any]:
     """
     Dismiss popup/dialog by clicking common buttons.
 
+    All candidate buttons are matched against one screen dump, and with
+    uiautomator2 a single device-side wait covers all of them.
+
     Args:
         button_texts: Button texts to try (default: common dismiss buttons)
-        timeout: Timeout for each button search
+        timeout: Total time to wait for one of the buttons to appear (0: current screen only)
 
     Returns:
         {"success": bool, "dismissed": bool, "button": str or None}
@@ -388,30 +465,25 @@ def dismiss_popup(
     router = get_router()
 
     if button_texts is None:
-        button_texts = [
-            "OK", "Cancel", "Close", "Dismiss", "Got it", "Not now",
-            "Skip", "Later", "No thanks", "Allow", "Deny",
-            "確定", "取消", "關閉", "略過", "稍後", "允許", "拒絕"
-        ]
-
-    for btn_text in button_texts:
-        if router.u2_available:
-            if router.click_if_exists(timeout=timeout, text=btn_text):
-                return {
-                    "success": True,
-                    "dismissed": True,
-                    "button": btn_text
-                }
-        else:
-            # Fallback: check if text exists then click
-            if router.has_text(btn_text):
-                ok, _ = router.click(text=btn_text, verify=False)
-                if ok:
-                    return {
-                        "success": True,
-                        "dismissed": True,
-                        "button": btn_text
-                    }
+        button_texts = POPUP_BUTTONS
+
+    element = _find_popup_button(router, button_texts)
+    if element is None and timeout and router.u2_available and button_texts:
+        # Exact match on any candidate text, each quoted literally for the Java regex
+        pattern = "|".join(f"\\Q{t}\\E" for t in button_texts if "\\E" not in t)
+        if pattern:
+            found, _ = router.wait_for_element_u2(timeout=timeout, textMatches=f"^(?:{pattern})$")
+            if found:
+                element = _find_popup_button(router, button_texts)
+
+    if element is not None:
+        ok, _ = router.click(element=element, verify=False)
+        if ok:
+            return {
+                "success": True,
+                "dismissed": True,
+                "button": element.text
+            }
 
     return {
         "success": True,
@@ -438,23 +510,20 @@ def launch_and_wait(
         {"success": bool, "message": str}
     """
     router = get_router()
-    import time
 
     # Launch app
     ok, msg = router.launch_app(package, wait=2.0)
     if not ok:
         return {"success": False, "message": f"Launch failed: {msg}"}
 
-    # Wait for ready indicator
+    # Wait for ready indicator (returns as soon as it appears)
     if wait_text:
-        start = time.time()
-        while time.time() - start < timeout:
-            if router.has_text(wait_text):
-                return {
-                    "success": True,
-                    "message": f"App ready (found: {wait_text})"
-                }
-            time.sleep(0.5)
+        found, _ = router.wait_for_element_u2(timeout=timeout, textContains=wait_text)
+        if found:
+            return {
+                "success": True,
+                "message": f"App ready (found: {wait_text})"
+            }
 
         return {
             "success": False,
@@ -481,30 +550,25 @@ def get_screen_summary() -> Dict[str, Any]:
     router = get_router()
     executor = get_executor()
 
+    # Package lookup and screen dump are independent round trips: overlap them
+    package_future = _io_pool.submit(router.get_current_package)
     state = executor.observe()
-    package = router.get_current_package()
+    package = package_future.result()
 
-    # Extract useful info
-    texts = []
-    buttons = []
-    clickable_count = 0
-
-    for el in state.elements:
-        if el.text:
-            texts.append(el.text)
-        if el.clickable:
-            clickable_count += 1
-            if el.text:
-                buttons.append(el.text)
+    # Extract useful info, stopping once each list is full (limits avoid huge responses);
+    # the clickable count comes from the column index, not from the elements
+    texts = list(islice((el.text for el in state.elements if el.text), SUMMARY_MAX_TEXTS))
+    buttons = list(islice((el.text for el in state.elements if el.clickable and el.text),
+                          SUMMARY_MAX_BUTTONS))
 
     return {
         "success": True,
         "package": package,
         "element_count": len(state.elements),
-        "clickable_count": clickable_count,
+        "clickable_count": state.count(clickable=True),
         "screen_hash": state.screen_hash,
-        "texts": texts[:20],  # Limit to avoid huge responses
-        "buttons": buttons[:15]
+        "texts": texts,
+        "buttons": buttons
     }
 
 
@@ -541,15 +605,21 @@ def run_patrol(
         }
     """
     try:
-        from patrol import PatrolStateMachine, PatrolConfig
-
         config = PatrolConfig(
             max_posts=max_posts,
             max_scrolls=max_scrolls,
             max_time_minutes=max_time_minutes
         )
 
-        patrol = PatrolStateMachine(platform=platform, config=config)
+        # Machines (device connection + platform adapter) are reused per platform,
+        # with per-run tracking cleared between patrols
+        patrol = _patrol_machines.get(platform)
+        if patrol is None:
+            patrol = PatrolStateMachine(platform=platform, config=config)
+            _patrol_machines[platform] = patrol
+        else:
+            patrol.reset()
+        patrol.config = config
         report = patrol.run(keyword)
 
         return {
@@ -561,7 +631,7 @@ def run_patrol(
         }
 
     except Exception as e:
-        logger.error(f"Patrol failed: {e}")
+        logger.error("Patrol failed: %s", e)
         return {
             "success": False,
             "posts_visited": 0,
@@ -639,7 +709,8 @@ TOOLS = [
             "type": "object",
             "properties": {
                 "expected_text": {"type": "string", "description": "Text expected on previous screen"},
-                "max_attempts": {"type": "integer", "default": 3}
+                "max_attempts": {"type": "integer", "default": 3},
+                "verify": {"type": "boolean", "default": True, "description": "Verify screen changed (skip for a plain back press)"}
             }
         }
     },
@@ -654,7 +725,7 @@ TOOLS = [
                     "items": {"type": "string"},
                     "description": "Button texts to try (uses defaults if not provided)"
                 },
-                "timeout": {"type": "number", "default": 2.0}
+                "timeout": {"type": "number", "default": 0.5, "description": "Wait for a late popup (0: current screen only)"}
             }
         }
     },
@@ -700,6 +771,11 @@ TOOLS = [
     }
 ]
 
+# Tool name -> implementation, one entry per TOOLS schema
+TOOL_HANDLERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    tool["name"]: globals()[tool["name"]] for tool in TOOLS
+}
+
 
 def create_mcp_server():
     """Create and configure MCP server"""
@@ -707,43 +783,34 @@ def create_mcp_server():
         raise ImportError("MCP SDK not installed. Run: pip install mcp")
 
     server = Server("mobile-macro")
+    # Macros share one device and screen state, so they run one at a time
+    device_lock = asyncio.Lock()
+
+    # Tool schemas never change, so build them once per server
+    tools = [Tool(**t) for t in TOOLS]
 
     @server.list_tools()
     async def list_tools():
-        return [Tool(**t) for t in TOOLS]
+        return tools
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict):
-        """Handle tool calls"""
+        """Handle tool calls (blocking macros run in a worker thread, keeping the loop responsive)"""
         try:
-            if name == "find_and_click":
-                result = find_and_click(**arguments)
-            elif name == "type_and_submit":
-                result = type_and_submit(**arguments)
-            elif name == "smart_wait":
-                result = smart_wait(**arguments)
-            elif name == "scroll_and_find":
-                result = scroll_and_find(**arguments)
-            elif name == "navigate_back":
-                result = navigate_back(**arguments)
-            elif name == "dismiss_popup":
-                result = dismiss_popup(**arguments)
-            elif name == "launch_and_wait":
-                result = launch_and_wait(**arguments)
-            elif name == "get_screen_summary":
-                result = get_screen_summary()
-            elif name == "run_patrol":
-                result = run_patrol(**arguments)
+            tool = TOOL_HANDLERS.get(name)
+            if tool:
+                async with device_lock:
+                    result = await asyncio.to_thread(tool, **(arguments or {}))
             else:
                 result = {"success": False, "message": f"Unknown tool: {name}"}
 
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=_to_json(result))]
 
         except Exception as e:
-            logger.error(f"Tool {name} failed: {e}")
+            logger.error("Tool %s failed: %s", name, e)
             return [TextContent(
                 type="text",
-                text=json.dumps({"success": False, "error": str(e)})
+                text=_to_json({"success": False, "error": str(e)})
             )]
 
     return server
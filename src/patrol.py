@@ -24,20 +24,23 @@ Usage:
     print(report.summary)
 """
 import os
+import re
 import sys
 import time
-import json
+import hashlib
 from typing import Optional, Dict, List, Tuple, Any, Callable
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
+from itertools import count, islice
 
 # Setup paths
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
 from logger import get_logger
-from executor import DeterministicExecutor, ScreenState, Element, ExecutionResult, ActionResult
+from executor import ScreenState, Element, ExecutionResult, ActionResult
+from data_utils import DATACLASS_SLOTS, write_json, json_line
 from tool_router import ToolRouter
 from state_tracker import StateTracker, NavigationState, VisitedItem
 from platform_adapter import get_adapter, PlatformAdapter, PostCard
@@ -48,12 +51,36 @@ logger = get_logger(__name__)
 REPORTS_DIR = os.path.join(PROJECT_ROOT, "outputs", "patrol_reports")
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
+_USERNAME_RE = re.compile(r'@[\w.]+')
+
+# Engagement labels in priority order, and one pattern matching any of them
+_ENGAGEMENT_KEYWORDS = (
+    ('likes', ('like', '讚')),
+    ('comments', ('comment', '留言', 'repl')),
+    ('shares', ('share', '分享')),
+)
+_ENGAGEMENT_RE = re.compile('|'.join(re.escape(keyword)
+                                     for _, keywords in _ENGAGEMENT_KEYWORDS
+                                     for keyword in keywords))
+
+# (epoch second, its ISO 8601 string): posts collected within one second share it
+_iso_cache: Tuple[int, str] = (0, "")
+
+
+def _iso_now() -> str:
+    """Local time as ISO 8601 to the second, formatted at most once per second"""
+    global _iso_cache
+    now = int(time.time())
+    if now != _iso_cache[0]:
+        _iso_cache = (now, datetime.fromtimestamp(now).isoformat())
+    return _iso_cache[1]
+
 
 # =============================================================================
 # Configuration
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PatrolConfig:
     """Configuration for patrol behavior"""
     # Budget limits
@@ -67,10 +94,10 @@ class PatrolConfig:
     comment_scrolls: int = 2     # Scroll times in comments
 
     # Timing
-    wait_after_search: float = 2.0    # Wait after search submit
-    wait_after_click: float = 1.0     # Wait after clicking post
-    wait_after_scroll: float = 1.0    # Wait after scroll
-    wait_after_back: float = 1.0      # Wait after back navigation
+    wait_after_search: float = 2.0    # Max wait for search results
+    wait_after_click: float = 1.0     # Max wait for post/comments to open
+    wait_after_scroll: float = 1.0    # Max wait for scroll to settle
+    wait_after_back: float = 1.0      # Max wait after back navigation
 
     # Behavior flags
     verify_actions: bool = True       # Verify each action
@@ -79,7 +106,7 @@ class PatrolConfig:
     auto_save_report: bool = True     # Auto-save report on completion
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PostData:
     """Data collected from a single post"""
     title: str = ""
@@ -93,7 +120,7 @@ class PostData:
     metadata: Dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PatrolReport:
     """Complete patrol report"""
     keyword: str
@@ -225,6 +252,9 @@ class PatrolStateMachine:
     - Automatic error recovery
     """
 
+    # Observations younger than this are reused when no input has fired since
+    OBSERVE_MAX_AGE = 0.3
+
     def __init__(self, platform: str = "threads", config: PatrolConfig = None,
                  device_id: str = None):
         """
@@ -240,17 +270,22 @@ class PatrolStateMachine:
         self.device_id = device_id
 
         # Core components
-        self.executor = DeterministicExecutor(device_id)
+        # One executor for both, so router input invalidates cached observations
         self.router = ToolRouter(device_id)
+        self.executor = self.router.executor
         self.tracker = StateTracker(platform=platform)
 
         # Platform adapter (unified interface for platform-specific logic)
         self.adapter = get_adapter(platform)
+        self._adapter_name = type(self.adapter).__name__
 
         # State
         self.state = PatrolState.INIT
         self.keyword = ""
         self.report = None
+        # Report files: "<base>.jsonl" gets each post as it is collected, "<base>.json" the summary
+        self._report_base: Optional[str] = None
+        self._post_sink = None
 
         # Tracking
         self.posts_collected: List[PostData] = []
@@ -263,12 +298,25 @@ class PatrolStateMachine:
         self.package = self.adapter.package_name
         self.patterns = SEARCH_PATTERNS.get(platform, SEARCH_PATTERNS["default"])
 
-        logger.info(f"Patrol initialized: platform={platform}, package={self.package}, adapter={type(self.adapter).__name__}")
+        logger.info(f"Patrol initialized: platform={platform}, package={self.package}, adapter={self._adapter_name}")
 
     # =========================================================================
     # Main Entry Point
     # =========================================================================
 
+    def reset(self):
+        """
+        Clear per-run tracking so the machine can be reused for another patrol.
+
+        Starts a fresh tracker session, as a newly constructed machine would.
+        """
+        self.package = self.adapter.package_name
+        self.posts_collected = []
+        self.current_post = None
+        self.scroll_count = 0
+        self.error_count = 0
+        self.tracker = StateTracker(platform=self.platform)
+
     def run(self, keyword: str, package: str = None) -> PatrolReport:
         """
         Run the patrol.
@@ -291,9 +339,19 @@ class PatrolStateMachine:
             platform=self.platform,
             start_time=self.start_time
         )
+        if self.config.auto_save_report:
+            self._open_post_sink()
 
         logger.info(f"Starting patrol: keyword='{keyword}', platform={self.platform}")
 
+        try:
+            return self._execute()
+        finally:
+            # _save_report closes the posts file; don't leak it if finalizing fails
+            self._close_post_sink()
+
+    def _execute(self) -> PatrolReport:
+        """Launch, search and patrol; errors are recorded on the report"""
         try:
             # Launch app
             if not self._launch_app():
@@ -342,6 +400,15 @@ class PatrolStateMachine:
         time.sleep(2)
         return True  # Proceed anyway, might work
 
+    def _observe(self) -> ScreenState:
+        """Observe the screen, reusing a state from the same UI frame"""
+        return self.executor.observe(max_age=self.OBSERVE_MAX_AGE)
+
+    def _wait_for_screen(self, check: Callable[[List[Any]], bool],
+                         timeout: float) -> Tuple[bool, ScreenState]:
+        """Wait until an adapter screen check passes, exiting early instead of sleeping"""
+        return self.router.wait_for(lambda state: check(state.elements), timeout=timeout)
+
     def _do_search(self) -> bool:
         """Execute search flow using platform adapter"""
         self.state = PatrolState.FINDING_SEARCH
@@ -349,12 +416,12 @@ class PatrolStateMachine:
         # Find search icon/input using adapter
         search_found = False
         for attempt in range(3):
-            state = self.executor.observe()
+            state = self._observe()
 
             # Use adapter to find search input directly
             search_input = self.adapter.find_search_input(state.elements)
             if search_input:
-                logger.info(f"Found search input via {type(self.adapter).__name__}")
+                logger.info("Found search input via %s", self._adapter_name)
                 ok, _ = self.router.click(element=search_input)
                 if ok:
                     search_found = True
@@ -363,12 +430,12 @@ class PatrolStateMachine:
             # Use adapter to find search entry (icon/tab)
             search_entry = self.adapter.find_search_entry(state.elements)
             if search_entry:
-                logger.info(f"Found search entry via {type(self.adapter).__name__}")
+                logger.info("Found search entry via %s", self._adapter_name)
                 ok, _ = self.router.click(element=search_entry)
                 if ok:
                     time.sleep(1)
-                    # After clicking entry, look for input again
-                    state = self.executor.observe()
+                    # After clicking entry, look for input in the focused window only
+                    state = self.router.observe_focused_window()
                     search_input = self.adapter.find_search_input(state.elements)
                     if search_input:
                         self.router.click(element=search_input, verify=False)
@@ -398,13 +465,12 @@ class PatrolStateMachine:
             self.report.errors.append("Failed to type search query")
             return False
 
-        # Wait for results
-        time.sleep(self.config.wait_after_search)
+        # Wait for results, verified via adapter
+        results_shown, state = self._wait_for_screen(self.adapter.is_search_results,
+                                                     self.config.wait_after_search)
         self.state = PatrolState.VIEWING_RESULTS
 
-        # Verify results appeared using adapter
-        state = self.executor.observe()
-        if self.adapter.is_search_results(state.elements):
+        if results_shown:
             logger.info("Search results verified via adapter")
         else:
             logger.warning("Could not verify search results, continuing anyway")
@@ -421,10 +487,10 @@ class PatrolStateMachine:
         """Main patrol loop: scan results, visit posts, collect data"""
         while self._should_continue():
             try:
-                # Scan current results
-                posts = self._scan_visible_posts()
+                # Scan current results up to the first unvisited post
+                unvisited, found_any = self._next_unvisited_post()
 
-                if not posts:
+                if not found_any:
                     # No posts found, try scrolling
                     if self.scroll_count < self.config.max_scrolls:
                         self._scroll_results()
@@ -433,9 +499,6 @@ class PatrolStateMachine:
                         logger.info("No more posts to visit, stopping")
                         break
 
-                # Find unvisited post
-                unvisited = self._find_unvisited_post(posts)
-
                 if unvisited:
                     # Visit the post
                     self._visit_post(unvisited)
@@ -458,17 +521,18 @@ class PatrolStateMachine:
 
     def _should_continue(self) -> bool:
         """Check if patrol should continue"""
-        # Budget checks
-        if len(self.posts_collected) >= self.config.max_posts:
-            logger.info(f"Reached max posts: {self.config.max_posts}")
+        # Budget checks (run once per loop iteration)
+        config = self.config
+        if len(self.posts_collected) >= config.max_posts:
+            logger.info(f"Reached max posts: {config.max_posts}")
             return False
 
         elapsed = (time.time() - self.start_time) / 60
-        if elapsed >= self.config.max_time_minutes:
-            logger.info(f"Reached time limit: {self.config.max_time_minutes}m")
+        if elapsed >= config.max_time_minutes:
+            logger.info(f"Reached time limit: {config.max_time_minutes}m")
             return False
 
-        if self.error_count >= self.config.max_consecutive_errors:
+        if self.error_count >= config.max_consecutive_errors:
             logger.warning("Too many consecutive errors")
             return False
 
@@ -484,42 +548,56 @@ class PatrolStateMachine:
 
     def _scan_visible_posts(self) -> List[Dict]:
         """Scan visible posts from current screen using platform adapter"""
-        state = self.executor.observe()
+        state = self._observe()
 
         # Use adapter for platform-specific post extraction
-        post_cards = self.adapter.extract_post_cards(state.elements)
-
-        # Convert PostCard to dict format (for backward compatibility)
-        posts = []
-        for card in post_cards:
-            posts.append({
-                "element": card.element,
-                "text": card.text,
-                "author": card.author_id or card.author,
-                "bounds": card.bounds,
-                "id": card.unique_id,
-                "card": card  # Keep original PostCard for richer data
-            })
-
-        logger.debug(f"Found {len(posts)} potential posts via {type(self.adapter).__name__}")
+        posts = [self._post_from_card(card) for card in self.adapter.iter_post_cards(state.elements)]
+
+        logger.debug("Found %d potential posts via %s", len(posts), self._adapter_name)
         return posts
 
+    def _next_unvisited_post(self) -> Tuple[Optional[Dict], bool]:
+        """
+        Scan the current screen only as far as the first unvisited post.
+
+        Returns:
+            (post dict or None, whether any post was seen)
+        """
+        state = self._observe()
+        found_any = False
+        for card in self.adapter.iter_post_cards(state.elements):
+            found_any = True
+            post_id = card.unique_id
+            if not self.tracker.is_visited(item_id=post_id):
+                return self._post_from_card(card, post_id), True
+        return None, found_any
+
+    @staticmethod
+    def _post_from_card(card: PostCard, post_id: str = None) -> Dict:
+        """Convert PostCard to dict format (for backward compatibility)"""
+        return {
+            "element": card.element,
+            "text": card.text,
+            "author": card.author_id or card.author,
+            "bounds": card.bounds,
+            "id": post_id or card.unique_id,
+            "card": card  # Keep original PostCard for richer data
+        }
+
     def _extract_author(self, element: Element) -> str:
         """Extract author from element (heuristic)"""
         text = element.text or element.content_desc
         if '@' in text:
             # Find @username pattern
-            import re
-            match = re.search(r'@[\w.]+', text)
+            match = _USERNAME_RE.search(text)
             if match:
                 return match.group(0)
         return text[:30] if text else "unknown"
 
     def _generate_post_id(self, element: Element) -> str:
         """Generate unique ID for post element"""
-        import hashlib
         data = f"{element.text}|{element.identifier}|{element.bounds}"
-        return hashlib.md5(data.encode()).hexdigest()[:16]
+        return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
 
     def _find_unvisited_post(self, posts: List[Dict]) -> Optional[Dict]:
         """Find first unvisited post"""
@@ -537,7 +615,7 @@ class PatrolStateMachine:
         self.state = PatrolState.ENTERING_POST
 
         # Save state before navigation
-        current_state = self.executor.observe()
+        current_state = self._observe()
         self.tracker.push_history(current_state.screen_hash, {"state": "results"})
 
         # Click post
@@ -547,7 +625,7 @@ class PatrolStateMachine:
             self.tracker.mark_visited(item_id=post_id, title=post.get("text", ""))
             return
 
-        time.sleep(self.config.wait_after_click)
+        self._wait_for_screen(self.adapter.is_post_detail, self.config.wait_after_click)
         self.state = PatrolState.READING_POST
 
         # Collect post data
@@ -564,8 +642,9 @@ class PatrolStateMachine:
             author=self.current_post.author
         )
 
-        # Add to collected posts
+        # Add to collected posts (and persist it right away)
         self.posts_collected.append(self.current_post)
+        self._write_post(self.current_post)
         self.error_count = 0  # Reset error count on success
 
         # Back to results
@@ -573,31 +652,31 @@ class PatrolStateMachine:
 
     def _collect_post_data(self, post: Dict) -> PostData:
         """Collect data from current post view"""
-        state = self.executor.observe()
+        state = self._observe()
+        # Columns come straight from the dump, no Elements are built
+        texts = state.column('text_exact')
 
         # Extract visible text
-        all_text = []
-        for el in state.elements:
-            if el.text:
-                all_text.append(el.text)
+        all_text = list(islice(filter(None, texts), 10))
 
         # Find engagement (likes, comments, shares)
         engagement = {}
-        for el in state.elements:
-            text = (el.text or el.content_desc or "").lower()
-            if 'like' in text or '讚' in text:
-                engagement['likes'] = el.text
-            elif 'comment' in text or '留言' in text or 'repl' in text:
-                engagement['comments'] = el.text
-            elif 'share' in text or '分享' in text:
-                engagement['shares'] = el.text
+        for raw, text_lower, desc_lower in zip(texts, state.column('text'), state.column('content_desc')):
+            text = text_lower if raw else desc_lower
+            # One scan rules out most elements; only hits go through the priority order
+            if not _ENGAGEMENT_RE.search(text):
+                continue
+            for metric, keywords in _ENGAGEMENT_KEYWORDS:
+                if any(keyword in text for keyword in keywords):
+                    engagement[metric] = raw
+                    break
 
         return PostData(
             title=post.get("text", "")[:200],
             author=post.get("author", ""),
-            content="\n".join(all_text[:10]),
+            content="\n".join(all_text),
             engagement=engagement,
-            timestamp=datetime.now().isoformat(),
+            timestamp=_iso_now(),
             metadata={"post_id": post.get("id")}
         )
 
@@ -606,13 +685,8 @@ class PatrolStateMachine:
         self.state = PatrolState.ENTERING_COMMENTS
 
         # Find comments section
-        state = self.executor.observe()
-        comments_el = (
-            state.find(text="comment") or
-            state.find(text="留言") or
-            state.find(text="repl") or
-            state.find(text="回覆")
-        )
+        state = self._observe()
+        comments_el = state.find_any_text(["comment", "留言", "repl", "回覆"])
 
         if not comments_el:
             logger.debug("No comments section found")
@@ -624,41 +698,45 @@ class PatrolStateMachine:
             logger.debug("Comments click had no effect")
             return
 
-        time.sleep(self.config.wait_after_click)
+        self._wait_for_screen(self.adapter.is_comments_view, self.config.wait_after_click)
         self.state = PatrolState.READING_COMMENTS
 
         # Save state for back navigation
-        current = self.executor.observe()
+        current = self._observe()
         self.tracker.push_history(current.screen_hash, {"state": "post_detail"})
 
         # Scroll and collect comments
+        wanted = self.config.comments_per_post
+        settle_timeout = self.config.wait_after_scroll
         comments = []
-        for i in range(self.config.comment_scrolls):
-            state = self.executor.observe()
-
-            # Extract comment-like text
-            for el in state.elements:
-                if el.text and len(el.text) > 10:
+        seen = set()  # texts still on screen after a scroll are not collected twice
+        for _ in range(self.config.comment_scrolls):
+            state = self._observe()
+
+            # Extract new comment-like text (only those elements get built)
+            for i, text in enumerate(state.column('text_exact')):
+                if len(text) > 10 and text not in seen:
+                    seen.add(text)
                     comments.append({
-                        "text": el.text,
-                        "author": self._extract_author(el)
+                        "text": text,
+                        "author": self._extract_author(state.elements[i])
                     })
 
+            if len(comments) >= wanted:
+                break
+
             # Scroll for more comments
             self.router.swipe("up", verify=False)
-            time.sleep(self.config.wait_after_scroll)
-
-            if len(comments) >= self.config.comments_per_post:
-                break
+            self.executor.wait_for_screen_settle(settle_timeout)
 
         # Update current post data
         if self.current_post:
-            self.current_post.comments = comments[:self.config.comments_per_post]
+            self.current_post.comments = comments[:wanted]
 
         # Back to post
         self.state = PatrolState.RETURNING_TO_POST
         self.router.back(verify=True)
-        time.sleep(self.config.wait_after_back)
+        self._wait_for_screen(self.adapter.is_post_detail, self.config.wait_after_back)
         self.tracker.pop_history()
 
     def _back_to_results(self):
@@ -673,7 +751,7 @@ class PatrolStateMachine:
             time.sleep(0.5)
             self.router.back(verify=False)
 
-        time.sleep(self.config.wait_after_back)
+        self._wait_for_screen(self.adapter.is_search_results, self.config.wait_after_back)
         self.tracker.pop_history()
         self.state = PatrolState.VIEWING_RESULTS
 
@@ -684,11 +762,11 @@ class PatrolStateMachine:
         self.state = PatrolState.SCROLLING_RESULTS
         logger.debug(f"Scrolling results (scroll #{self.scroll_count + 1})")
 
+        # Verified swipe returns once the new content has settled
         self.router.swipe("up")
         self.scroll_count += 1
         self.tracker.record_scroll()
 
-        time.sleep(self.config.wait_after_scroll)
         self.state = PatrolState.VIEWING_RESULTS
 
     # =========================================================================
@@ -720,25 +798,59 @@ class PatrolStateMachine:
         logger.info(f"Patrol completed: {len(self.posts_collected)} posts, {self.scroll_count} scrolls")
         return self.report
 
-    def _save_report(self):
-        """Save report to file"""
+    def _open_post_sink(self):
+        """Start the report files: posts are appended to <base>.jsonl as they are collected"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"patrol_{self.platform}_{timestamp}.json"
-        filepath = os.path.join(REPORTS_DIR, filename)
+        base = os.path.join(REPORTS_DIR, f"patrol_{self.platform}_{timestamp}")
+        # Runs started within the same second get a numbered suffix, never a shared file
+        for attempt in count(1):
+            self._report_base = base if attempt == 1 else f"{base}_{attempt}"
+            try:
+                self._post_sink = open(self._report_base + ".jsonl", 'xb', buffering=64 * 1024)
+                return
+            except FileExistsError:
+                continue
+
+    def _close_post_sink(self):
+        """Close the posts file if it is open"""
+        if self._post_sink is not None:
+            self._post_sink.close()
+            self._post_sink = None
+
+    def _write_post(self, post: PostData):
+        """Append one post to the JSONL report, flushed so a crash keeps it"""
+        if self._post_sink is None:
+            return
+        self._post_sink.write(json_line(post))
+        self._post_sink.flush()
 
+    def _save_report(self):
+        """
+        Save the report summary to <base>.json and close the posts file.
+
+        Posts live in <base>.jsonl, one JSON object per line, written as the
+        patrol collects them; the summary only carries metadata and stats.
+        """
+        if self._post_sink is None:
+            # Not streamed during the run: write the collected posts now
+            self._open_post_sink()
+            for post in self.report.posts:
+                self._post_sink.write(json_line(post))
+        self._close_post_sink()
+
+        filepath = self._report_base + ".json"
         data = {
             "keyword": self.report.keyword,
             "platform": self.report.platform,
             "start_time": self.report.start_time,
             "end_time": self.report.end_time,
             "duration": self.report.duration,
-            "posts": [asdict(p) for p in self.report.posts],
+            "posts_file": os.path.basename(self._report_base) + ".jsonl",
             "stats": self.report.stats,
             "errors": self.report.errors
         }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        write_json(filepath, data)
 
         logger.info(f"Report saved: {filepath}")
 
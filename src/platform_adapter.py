@@ -29,8 +29,10 @@ Usage:
 import os
 import sys
 import re
+import hashlib
+import functools
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, Tuple, Iterator, Callable, Sequence
 from dataclasses import dataclass, field
 
 # Setup paths
@@ -38,15 +40,69 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
 from logger import get_logger
+from data_utils import DATACLASS_SLOTS
 
 logger = get_logger(__name__)
 
+# Author and count patterns shared by all adapters
+_USERNAME_RE = re.compile(r'@[\w.]+')
+_NAME_BEFORE_AT_RE = re.compile(r'^([^@]+)\s*@')
+_COUNT_RE = re.compile(r'[\d,.]+[kmb]?')
+
+# Separator for joined field columns (never present in UI strings)
+_FIELD_SEP = "\x00"
+
+# Resource-id fragments of navigation chrome, skipped when scanning content
+_NAV_ID_RE = re.compile('tab|nav|bottom_bar|toolbar|action_bar')
+
+
+@functools.lru_cache(maxsize=256)
+def _pattern_re(patterns: Tuple[str, ...]) -> re.Pattern:
+    """
+    One alternation matching any of the literal patterns, for lowercased text.
+
+    Built once per distinct pattern list, so a check costs a single C-level
+    scan however many patterns it has. An empty list matches nothing.
+    """
+    if not patterns:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(re.escape(pattern.lower()) for pattern in patterns))
+
+
+def _matching_rows(regex: re.Pattern, joined: str) -> Iterator[int]:
+    """
+    Index of each _FIELD_SEP-joined row the regex matches, each row once.
+
+    The whole column is scanned by the regex engine; Python only runs per
+    matching row, not per element.
+    """
+    row, pos = 0, 0
+    while True:
+        match = regex.search(joined, pos)
+        if match is None:
+            return
+        row += joined.count(_FIELD_SEP, pos, match.start())
+        yield row
+        # Resume after this row's separator
+        pos = joined.find(_FIELD_SEP, match.start()) + 1
+        if pos == 0:
+            return
+        row += 1
+
+
+# Engagement metric -> label keywords (lowercase), checked in this order
+_ENGAGEMENT_LABELS = (
+    ('likes', ('like', '讚', '喜歡')),
+    ('comments', ('comment', '留言', 'repl', '回覆')),
+    ('shares', ('share', '分享', 'repost', '轉')),
+)
+
 
 # =============================================================================
 # Data Classes
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PostCard:
     """Represents a post card in feed/results"""
     author: str = ""
@@ -60,13 +116,15 @@ class PostCard:
     element: Any = None  # Original element reference
     bounds: Dict = field(default_factory=dict)
     index: int = 0  # Position in list
+    _unique_id: str = field(default="", init=False, repr=False, compare=False)
 
     @property
     def unique_id(self) -> str:
-        """Generate unique ID for deduplication"""
-        import hashlib
-        data = f"{self.author_id}|{self.text_preview[:50]}|{self.index}"
-        return hashlib.md5(data.encode()).hexdigest()[:16]
+        """Unique ID for deduplication, hashed on first access"""
+        if not self._unique_id:
+            data = f"{self.author_id}|{self.text_preview[:50]}|{self.index}"
+            self._unique_id = hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+        return self._unique_id
 
 
 @dataclass
@@ -79,6 +137,11 @@ class PlatformConfig:
     comment_indicators: List[str] = field(default_factory=list)
     skip_texts: List[str] = field(default_factory=list)
 
+    @property
+    def skip_re(self) -> re.Pattern:
+        """Regex matching any of skip_texts (cached per list contents, so edits apply)"""
+        return _pattern_re(tuple(self.skip_texts))
+
 
 # =============================================================================
 # Abstract Base Adapter
@@ -91,8 +154,18 @@ class PlatformAdapter(ABC):
     Subclasses implement platform-specific element identification and extraction.
     """
 
+    # Element snapshots whose lowercased fields are kept (one per observation)
+    SCAN_CACHE_SIZE = 4
+
+    # Screen-state checks whose result is kept per element snapshot
+    SNAPSHOT_PREDICATES = ('is_search_results', 'is_post_detail', 'is_comments_view',
+                           'is_home_feed', 'is_login_wall', 'is_popup')
+
     def __init__(self):
         self.config = self._get_config()
+        self._scans: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+        for name in self.SNAPSHOT_PREDICATES:
+            setattr(self, name, self._per_snapshot(name, getattr(self, name)))
 
     @abstractmethod
     def _get_config(self) -> PlatformConfig:
@@ -152,21 +225,123 @@ class PlatformAdapter(ABC):
             patterns: Text patterns to match
             field: Field to check ("text", "content_desc", "identifier")
         """
-        for el in elements:
-            value = ""
-            if field == "text":
-                value = getattr(el, 'text', '') or ''
-            elif field == "content_desc":
-                value = getattr(el, 'content_desc', '') or ''
-            elif field == "identifier":
-                value = getattr(el, 'identifier', '') or ''
-
-            value_lower = value.lower()
-            for pattern in patterns:
-                if pattern.lower() in value_lower:
-                    return el
+        # The first hit in the joined column is in the first matching element
+        joined = self._joined(elements, field)
+        match = _pattern_re(tuple(patterns)).search(joined)
+        if match is None:
+            return None
+        return elements[joined.count(_FIELD_SEP, 0, match.start())]
+
+    def find_element_by_type(self, elements: List[Any], type_names: List[str],
+                             id_patterns: List[str] = ()) -> Optional[Any]:
+        """
+        Find the first element whose class contains any of type_names (case
+        sensitive, e.g. "EditText") or whose identifier contains any of
+        id_patterns. Structural matches like these are the cheapest and most
+        stable tier, so adapters try them before text patterns.
+        """
+        types = self._values(elements, 'element_type')
+        identifiers = self._values(elements, 'identifier') if id_patterns else None
+        for i, el_type in enumerate(types):
+            if any(name in el_type for name in type_names):
+                return elements[i]
+            if identifiers is not None and any(p in identifiers[i] for p in id_patterns):
+                return elements[i]
         return None
 
+    def _scan(self, elements: List[Any]) -> Dict[str, Any]:
+        """
+        Per-snapshot cache of derived fields, so the several state checks made
+        on one observation share a single pass. Only read-only sequences
+        (e.g. a ScreenState's elements) are cached, recognised by identity;
+        a plain list may be edited in place, so it gets a fresh scan per call.
+        """
+        if isinstance(elements, list) or not isinstance(elements, Sequence):
+            return {}
+        key = id(elements)
+        entry = self._scans.get(key)
+        if entry is not None and entry[0] is elements:
+            return entry[1]
+
+        scan = {}
+        self._scans[key] = (elements, scan)
+        if len(self._scans) > self.SCAN_CACHE_SIZE:
+            del self._scans[next(iter(self._scans))]
+        return scan
+
+    def _per_snapshot(self, name: str,
+                      predicate: Callable[[List[Any]], bool]) -> Callable[[List[Any]], bool]:
+        """
+        Wrap a bound screen predicate so repeat checks of one element snapshot
+        (e.g. polling a reused observation) return the stored result.
+        """
+        @functools.wraps(predicate)
+        def check(elements: List[Any]) -> bool:
+            scan = self._scan(elements)
+            result = scan.get(name)
+            if result is None:
+                result = scan[name] = predicate(elements)
+            return result
+        return check
+
+    def _values(self, elements: List[Any], field: str) -> List[str]:
+        """Field value for each element ('' when missing)"""
+        scan = self._scan(elements)
+        values = scan.get(field)
+        if values is None:
+            values = [getattr(el, field, '') or '' for el in elements]
+            scan[field] = values
+        return values
+
+    def _lowered(self, elements: List[Any], field: str) -> List[str]:
+        """Lowercased field value for each element"""
+        scan = self._scan(elements)
+        key = field + '_lower'
+        values = scan.get(key)
+        if values is None:
+            values = [value.lower() for value in self._values(elements, field)]
+            scan[key] = values
+        return values
+
+    def _joined(self, elements: List[Any], field: str) -> str:
+        """Lowercased field values joined by _FIELD_SEP, so str.find scans them in C"""
+        scan = self._scan(elements)
+        key = field + '_joined'
+        joined = scan.get(key)
+        if joined is None:
+            joined = _FIELD_SEP.join(self._lowered(elements, field))
+            scan[key] = joined
+        return joined
+
+    def _skip_mask(self, elements: List[Any]) -> List[bool]:
+        """is_skip_element for every element, computed from the cached lowered columns"""
+        scan = self._scan(elements)
+        # Keyed by the regex too, so an edited skip_texts builds a new mask
+        skip_re = self.config.skip_re
+        key = ('skip', skip_re)
+        mask = scan.get(key)
+        if mask is None:
+            mask = [False] * len(elements)
+            for row in _matching_rows(skip_re, self._joined(elements, 'text')):
+                mask[row] = True
+            for row in _matching_rows(_NAV_ID_RE, self._joined(elements, 'identifier')):
+                mask[row] = True
+            scan[key] = mask
+        return mask
+
+    def _haystack(self, elements: List[Any]) -> str:
+        """Lowercased "text desc" of every element, one per line, for C-level substring scans"""
+        scan = self._scan(elements)
+        haystack = scan.get('haystack')
+        if haystack is None:
+            haystack = '\n'.join(
+                text + ' ' + desc
+                for text, desc in zip(self._lowered(elements, 'text'),
+                                      self._lowered(elements, 'content_desc'))
+            )
+            scan['haystack'] = haystack
+        return haystack
+
     # =========================================================================
     # State Detection
     # =========================================================================
@@ -201,10 +376,8 @@ class PlatformAdapter(ABC):
     def is_popup(self, elements: List[Any]) -> bool:
         """Check if a popup/dialog is showing"""
         # Look for dialog-like elements or common button patterns
-        has_dialog = any(
-            'dialog' in (getattr(el, 'element_type', '') or '').lower()
-            for el in elements
-        )
+        has_dialog = any('dialog' in element_type
+                         for element_type in self._lowered(elements, 'element_type'))
         has_dismiss = self._has_any_text(elements, [
             "OK", "Cancel", "Close", "Not now", "Later",
             "確定", "取消", "關閉", "稍後"
@@ -213,31 +386,28 @@ class PlatformAdapter(ABC):
 
     def _has_any_text(self, elements: List[Any], patterns: List[str]) -> bool:
         """Check if any element contains any of the patterns"""
-        for el in elements:
-            text = (getattr(el, 'text', '') or '').lower()
-            desc = (getattr(el, 'content_desc', '') or '').lower()
-            combined = text + ' ' + desc
-            for pattern in patterns:
-                if pattern.lower() in combined:
-                    return True
-        return False
+        if not elements:
+            return False
+        return _pattern_re(tuple(patterns)).search(self._haystack(elements)) is not None
 
     def _count_matching(self, elements: List[Any], patterns: List[str]) -> int:
         """Count elements matching any pattern"""
-        count = 0
-        for el in elements:
-            text = (getattr(el, 'text', '') or '').lower()
-            for pattern in patterns:
-                if pattern.lower() in text:
-                    count += 1
-                    break
-        return count
+        regex = _pattern_re(tuple(patterns))
+        return sum(1 for _ in _matching_rows(regex, self._joined(elements, 'text')))
 
     # =========================================================================
     # Content Extraction
     # =========================================================================
 
     @abstractmethod
+    def iter_post_cards(self, elements: List[Any]) -> Iterator[PostCard]:
+        """
+        Yield post cards from current screen, top to bottom.
+
+        Lazy, so a caller looking for one card stops scanning once it has it.
+        """
+        pass
+
     def extract_post_cards(self, elements: List[Any]) -> List[PostCard]:
         """
         Extract post cards from current screen.
@@ -245,7 +415,7 @@ class PlatformAdapter(ABC):
         Returns:
             List of PostCard objects representing visible posts
         """
-        pass
+        return list(self.iter_post_cards(elements))
 
     def extract_author(self, text: str) -> Tuple[str, str]:
         """
@@ -255,11 +425,11 @@ class PlatformAdapter(ABC):
             (display_name, @username or ID)
         """
         # Common pattern: @username
-        match = re.search(r'@[\w.]+', text)
+        match = _USERNAME_RE.search(text)
         if match:
             username = match.group(0)
             # Try to find display name before @
-            name_match = re.match(r'^([^@]+)\s*@', text)
+            name_match = _NAME_BEFORE_AT_RE.match(text)
             if name_match:
                 return name_match.group(1).strip(), username
             return username, username
@@ -278,44 +448,51 @@ class PlatformAdapter(ABC):
             {"likes": "123", "comments": "45", "shares": "6"}
         """
         engagement = {}
-        for el in elements:
-            text = (getattr(el, 'text', '') or '').lower()
-            desc = (getattr(el, 'content_desc', '') or '').lower()
-            combined = text + ' ' + desc
-
-            # Look for number + label patterns
-            if any(x in combined for x in ['like', '讚', '喜歡']):
-                nums = re.findall(r'[\d,.]+[kmb]?', combined)
-                if nums:
-                    engagement['likes'] = nums[0]
-            elif any(x in combined for x in ['comment', '留言', 'repl', '回覆']):
-                nums = re.findall(r'[\d,.]+[kmb]?', combined)
-                if nums:
-                    engagement['comments'] = nums[0]
-            elif any(x in combined for x in ['share', '分享', 'repost', '轉']):
-                nums = re.findall(r'[\d,.]+[kmb]?', combined)
-                if nums:
-                    engagement['shares'] = nums[0]
+        texts = self._lowered(elements, 'text')
+        descs = self._lowered(elements, 'content_desc')
+        # Only rows with count characters can yield a metric: find them with
+        # one scan per column instead of label-checking every element
+        rows = set(_matching_rows(_COUNT_RE, self._joined(elements, 'text')))
+        rows.update(_matching_rows(_COUNT_RE, self._joined(elements, 'content_desc')))
+        for row in sorted(rows):
+            combined = texts[row] + ' ' + descs[row]
+
+            # Look for number + label patterns (first matching label wins)
+            for metric, labels in _ENGAGEMENT_LABELS:
+                if any(label in combined for label in labels):
+                    count = _COUNT_RE.search(combined)
+                    if count:
+                        engagement[metric] = count.group(0)
+                    break
 
         return engagement
 
+    def _card_from_author_line(self, author_line: Tuple[str, Any, Dict],
+                               text: str, index: int) -> PostCard:
+        """
+        Build a card from a pending (text, element, bounds) author line and
+        its content text. Author lines with no content never become cards.
+        """
+        line, element, bounds = author_line
+        name, username = self.extract_author(line)
+        return PostCard(
+            author=name,
+            author_id=username,
+            text=text,
+            text_preview=text[:100],
+            element=element,
+            bounds=bounds,
+            index=index
+        )
+
     def is_skip_element(self, element: Any) -> bool:
         """Check if element should be skipped (navigation, system UI)"""
         text = (getattr(element, 'text', '') or '')
         identifier = (getattr(element, 'identifier', '') or '')
 
-        # Skip navigation and system elements
-        for skip in self.config.skip_texts:
-            if skip.lower() in text.lower():
-                return True
-
-        # Skip elements with navigation-related IDs
-        nav_ids = ['tab', 'nav', 'bottom_bar', 'toolbar', 'action_bar']
-        for nav_id in nav_ids:
-            if nav_id in identifier.lower():
-                return True
-
-        return False
+        # Skip navigation and system elements, then navigation-related IDs
+        return bool(self.config.skip_re.search(text.lower())
+                    or _NAV_ID_RE.search(identifier.lower()))
 
 
 # =============================================================================
@@ -350,11 +527,7 @@ class ThreadsAdapter(PlatformAdapter):
         )
 
     def find_search_input(self, elements: List[Any]) -> Optional[Any]:
-        for el in elements:
-            el_type = getattr(el, 'element_type', '') or ''
-            if 'EditText' in el_type or 'TextField' in el_type:
-                return el
-        return None
+        return self.find_element_by_type(elements, ["EditText", "TextField"])
 
     def find_comments_button(self, elements: List[Any]) -> Optional[Any]:
         return self.find_element_by_patterns(
@@ -379,12 +552,14 @@ class ThreadsAdapter(PlatformAdapter):
         reply_count = self._count_matching(elements, ["Reply", "回覆"])
         return reply_count >= 3
 
-    def extract_post_cards(self, elements: List[Any]) -> List[PostCard]:
-        posts = []
+    def iter_post_cards(self, elements: List[Any]) -> Iterator[PostCard]:
+        count = 0
+        # Author line of the card being read; the card is built on its first content line
+        author_line = None
         current_post = None
 
-        for i, el in enumerate(elements):
-            if self.is_skip_element(el):
+        for el, skip in zip(elements, self._skip_mask(elements)):
+            if skip:
                 continue
 
             text = getattr(el, 'text', '') or ''
@@ -397,26 +572,16 @@ class ThreadsAdapter(PlatformAdapter):
 
             # Detect author line (usually has @ or is at top of card)
             if '@' in text or (clickable and len(text) < 50):
-                name, username = self.extract_author(text)
-                if current_post and current_post.text:
-                    posts.append(current_post)
-                current_post = PostCard(
-                    author=name,
-                    author_id=username,
-                    element=el,
-                    bounds=bounds,
-                    index=len(posts)
-                )
-            elif current_post:
-                # Add to current post content
-                if not current_post.text:
-                    current_post.text = text
-                    current_post.text_preview = text[:100]
-
-        if current_post and current_post.text:
-            posts.append(current_post)
+                if current_post:
+                    yield current_post
+                    count += 1
+                author_line, current_post = (text, el, bounds), None
+            elif author_line and not current_post:
+                # First content line completes the card
+                current_post = self._card_from_author_line(author_line, text, count)
 
-        return posts
+        if current_post:
+            yield current_post
 
 
 # =============================================================================
@@ -446,11 +611,11 @@ class InstagramAdapter(PlatformAdapter):
         )
 
     def find_search_input(self, elements: List[Any]) -> Optional[Any]:
-        for el in elements:
-            el_type = getattr(el, 'element_type', '') or ''
-            text = getattr(el, 'text', '') or ''
-            if 'EditText' in el_type:
-                return el
+        # Tiered: a real input field first, then a clickable search bar
+        el = self.find_element_by_type(elements, ["EditText"])
+        if el:
+            return el
+        for el, text in zip(elements, self._values(elements, 'text')):
             if 'Search' in text and getattr(el, 'clickable', False):
                 return el
         return None
@@ -475,11 +640,11 @@ class InstagramAdapter(PlatformAdapter):
         comment_count = self._count_matching(elements, ["Reply", "回覆", "Like", "讚"])
         return comment_count >= 5
 
-    def extract_post_cards(self, elements: List[Any]) -> List[PostCard]:
-        posts = []
+    def iter_post_cards(self, elements: List[Any]) -> Iterator[PostCard]:
+        count = 0
 
-        for i, el in enumerate(elements):
-            if self.is_skip_element(el):
+        for el, skip in zip(elements, self._skip_mask(elements)):
+            if skip:
                 continue
 
             text = getattr(el, 'text', '') or ''
@@ -490,28 +655,28 @@ class InstagramAdapter(PlatformAdapter):
             # Instagram posts often have descriptive content_desc
             if desc and len(desc) > 20:
                 name, username = self.extract_author(desc)
-                posts.append(PostCard(
+                yield PostCard(
                     author=name,
                     author_id=username,
                     text=desc,
                     text_preview=desc[:100],
                     element=el,
                     bounds=bounds,
-                    index=len(posts)
-                ))
+                    index=count
+                )
+                count += 1
             elif clickable and len(text) > 20:
                 name, username = self.extract_author(text)
-                posts.append(PostCard(
+                yield PostCard(
                     author=name,
                     author_id=username,
                     text=text,
                     text_preview=text[:100],
                     element=el,
                     bounds=bounds,
-                    index=len(posts)
-                ))
-
-        return posts
+                    index=count
+                )
+                count += 1
 
 
 # =============================================================================
@@ -541,11 +706,7 @@ class XAdapter(PlatformAdapter):
         )
 
     def find_search_input(self, elements: List[Any]) -> Optional[Any]:
-        for el in elements:
-            el_type = getattr(el, 'element_type', '') or ''
-            if 'EditText' in el_type:
-                return el
-        return None
+        return self.find_element_by_type(elements, ["EditText"])
 
     def find_comments_button(self, elements: List[Any]) -> Optional[Any]:
         return self.find_element_by_patterns(
@@ -567,12 +728,14 @@ class XAdapter(PlatformAdapter):
         reply_count = self._count_matching(elements, ["Reply", "回覆"])
         return reply_count >= 3
 
-    def extract_post_cards(self, elements: List[Any]) -> List[PostCard]:
-        posts = []
+    def iter_post_cards(self, elements: List[Any]) -> Iterator[PostCard]:
+        count = 0
+        # Author line of the card being read; the card is built on its first content line
+        author_line = None
         current_post = None
 
-        for el in elements:
-            if self.is_skip_element(el):
+        for el, skip in zip(elements, self._skip_mask(elements)):
+            if skip:
                 continue
 
             text = getattr(el, 'text', '') or ''
@@ -584,24 +747,15 @@ class XAdapter(PlatformAdapter):
 
             # Author pattern: @username or name with @
             if '@' in text and len(text) < 50:
-                name, username = self.extract_author(text)
-                if current_post and current_post.text:
-                    posts.append(current_post)
-                current_post = PostCard(
-                    author=name,
-                    author_id=username,
-                    element=el,
-                    bounds=bounds,
-                    index=len(posts)
-                )
-            elif current_post and not current_post.text and len(text) > 10:
-                current_post.text = text
-                current_post.text_preview = text[:100]
-
-        if current_post and current_post.text:
-            posts.append(current_post)
+                if current_post:
+                    yield current_post
+                    count += 1
+                author_line, current_post = (text, el, bounds), None
+            elif author_line and not current_post and len(text) > 10:
+                current_post = self._card_from_author_line(author_line, text, count)
 
-        return posts
+        if current_post:
+            yield current_post
 
 
 # =============================================================================
@@ -631,11 +785,7 @@ class TikTokAdapter(PlatformAdapter):
         )
 
     def find_search_input(self, elements: List[Any]) -> Optional[Any]:
-        for el in elements:
-            el_type = getattr(el, 'element_type', '') or ''
-            if 'EditText' in el_type:
-                return el
-        return None
+        return self.find_element_by_type(elements, ["EditText"])
 
     def find_comments_button(self, elements: List[Any]) -> Optional[Any]:
         return self.find_element_by_patterns(
@@ -656,11 +806,11 @@ class TikTokAdapter(PlatformAdapter):
         comment_count = self._count_matching(elements, ["Reply", "回覆"])
         return comment_count >= 3
 
-    def extract_post_cards(self, elements: List[Any]) -> List[PostCard]:
-        posts = []
+    def iter_post_cards(self, elements: List[Any]) -> Iterator[PostCard]:
+        count = 0
 
-        for el in elements:
-            if self.is_skip_element(el):
+        for el, skip in zip(elements, self._skip_mask(elements)):
+            if skip:
                 continue
 
             text = getattr(el, 'text', '') or ''
@@ -674,17 +824,16 @@ class TikTokAdapter(PlatformAdapter):
 
             if clickable:
                 name, username = self.extract_author(content)
-                posts.append(PostCard(
+                yield PostCard(
                     author=name,
                     author_id=username,
                     text=content,
                     text_preview=content[:100],
                     element=el,
                     bounds=bounds,
-                    index=len(posts)
-                ))
-
-        return posts
+                    index=count
+                )
+                count += 1
 
 
 # =============================================================================
@@ -715,12 +864,7 @@ class YouTubeAdapter(PlatformAdapter):
         )
 
     def find_search_input(self, elements: List[Any]) -> Optional[Any]:
-        for el in elements:
-            el_type = getattr(el, 'element_type', '') or ''
-            identifier = getattr(el, 'identifier', '') or ''
-            if 'EditText' in el_type or 'search_edit_text' in identifier:
-                return el
-        return None
+        return self.find_element_by_type(elements, ["EditText"], id_patterns=["search_edit_text"])
 
     def find_comments_button(self, elements: List[Any]) -> Optional[Any]:
         return self.find_element_by_patterns(
@@ -742,11 +886,11 @@ class YouTubeAdapter(PlatformAdapter):
         has_add = self._has_any_text(elements, ["Add a comment", "新增留言"])
         return has_comments or has_add
 
-    def extract_post_cards(self, elements: List[Any]) -> List[PostCard]:
-        posts = []
+    def iter_post_cards(self, elements: List[Any]) -> Iterator[PostCard]:
+        count = 0
 
-        for el in elements:
-            if self.is_skip_element(el):
+        for el, skip in zip(elements, self._skip_mask(elements)):
+            if skip:
                 continue
 
             desc = getattr(el, 'content_desc', '') or ''
@@ -764,17 +908,16 @@ class YouTubeAdapter(PlatformAdapter):
                 if ' by ' in title:
                     title, channel = title.rsplit(' by ', 1)
 
-                posts.append(PostCard(
+                yield PostCard(
                     author=channel,
                     author_id=channel,
                     text=title,
                     text_preview=title[:100],
                     element=el,
                     bounds=bounds,
-                    index=len(posts)
-                ))
-
-        return posts
+                    index=count
+                )
+                count += 1
 
 
 # =============================================================================
@@ -803,11 +946,7 @@ class FacebookAdapter(PlatformAdapter):
         )
 
     def find_search_input(self, elements: List[Any]) -> Optional[Any]:
-        for el in elements:
-            el_type = getattr(el, 'element_type', '') or ''
-            if 'EditText' in el_type:
-                return el
-        return None
+        return self.find_element_by_type(elements, ["EditText"])
 
     def find_comments_button(self, elements: List[Any]) -> Optional[Any]:
         return self.find_element_by_patterns(
@@ -828,11 +967,11 @@ class FacebookAdapter(PlatformAdapter):
         comment_count = self._count_matching(elements, ["Reply", "回覆", "Like", "讚"])
         return comment_count >= 5
 
-    def extract_post_cards(self, elements: List[Any]) -> List[PostCard]:
-        posts = []
+    def iter_post_cards(self, elements: List[Any]) -> Iterator[PostCard]:
+        count = 0
 
-        for el in elements:
-            if self.is_skip_element(el):
+        for el, skip in zip(elements, self._skip_mask(elements)):
+            if skip:
                 continue
 
             text = getattr(el, 'text', '') or ''
@@ -843,17 +982,16 @@ class FacebookAdapter(PlatformAdapter):
             content = desc if len(desc) > len(text) else text
             if clickable and len(content) > 20:
                 name, username = self.extract_author(content)
-                posts.append(PostCard(
+                yield PostCard(
                     author=name,
                     author_id=username or name,
                     text=content,
                     text_preview=content[:100],
                     element=el,
                     bounds=bounds,
-                    index=len(posts)
-                ))
-
-        return posts
+                    index=count
+                )
+                count += 1
 
 
 # =============================================================================
@@ -881,11 +1019,7 @@ class GenericAdapter(PlatformAdapter):
         return self.find_element_by_patterns(elements, self.config.search_patterns)
 
     def find_search_input(self, elements: List[Any]) -> Optional[Any]:
-        for el in elements:
-            el_type = getattr(el, 'element_type', '') or ''
-            if 'EditText' in el_type or 'TextField' in el_type:
-                return el
-        return None
+        return self.find_element_by_type(elements, ["EditText", "TextField"])
 
     def find_comments_button(self, elements: List[Any]) -> Optional[Any]:
         return self.find_element_by_patterns(elements, self.config.comment_indicators)
@@ -900,11 +1034,11 @@ class GenericAdapter(PlatformAdapter):
     def is_comments_view(self, elements: List[Any]) -> bool:
         return self._count_matching(elements, self.config.comment_indicators) >= 2
 
-    def extract_post_cards(self, elements: List[Any]) -> List[PostCard]:
-        posts = []
+    def iter_post_cards(self, elements: List[Any]) -> Iterator[PostCard]:
+        count = 0
 
-        for el in elements:
-            if self.is_skip_element(el):
+        for el, skip in zip(elements, self._skip_mask(elements)):
+            if skip:
                 continue
 
             text = getattr(el, 'text', '') or ''
@@ -915,17 +1049,16 @@ class GenericAdapter(PlatformAdapter):
             content = desc if len(desc) > len(text) else text
             if clickable and len(content) > 15:
                 name, username = self.extract_author(content)
-                posts.append(PostCard(
+                yield PostCard(
                     author=name,
                     author_id=username or name,
                     text=content,
                     text_preview=content[:100],
                     element=el,
                     bounds=bounds,
-                    index=len(posts)
-                ))
-
-        return posts
+                    index=count
+                )
+                count += 1
 
 
 # =============================================================================
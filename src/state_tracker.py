@@ -39,6 +39,7 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
 from logger import get_logger
+from data_utils import DATACLASS_SLOTS
 
 logger = get_logger(__name__)
 
@@ -75,6 +76,10 @@ class StateSignal:
     exclude_texts: List[str] = field(default_factory=list)  # Text that should NOT appear
 
 
+# Joins element fields for detect_state (never present in UI strings)
+_SIGNAL_SEP = "\x00"
+
+
 # Platform-specific state detection rules
 STATE_SIGNALS: Dict[str, Dict[NavigationState, StateSignal]] = {
     "threads": {
@@ -193,7 +198,7 @@ STATE_SIGNALS: Dict[str, Dict[NavigationState, StateSignal]] = {
 # Visited Item
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class VisitedItem:
     """Represents a visited post/item"""
     item_id: str
@@ -207,12 +212,8 @@ class VisitedItem:
     def from_post(cls, title: str = "", author: str = "", index: int = 0,
                   platform: str = "", **extra) -> 'VisitedItem':
         """Create VisitedItem from post data"""
-        # Generate unique ID from available data
-        hash_input = f"{title}|{author}|{index}|{platform}"
-        item_id = hashlib.md5(hash_input.encode()).hexdigest()[:16]
-
         return cls(
-            item_id=item_id,
+            item_id=generate_post_id(title, author, index, platform),
             title=title,
             author=author,
             platform=platform,
@@ -224,7 +225,7 @@ class VisitedItem:
 # Navigation History Entry
 # =============================================================================
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class HistoryEntry:
     """Navigation history entry"""
     state: NavigationState
@@ -311,27 +312,32 @@ class StateTracker:
         # Merge signals (platform-specific takes priority)
         signals = {**default_signals, **platform_signals}
 
-        # Extract text and types from elements
-        element_texts = set()
-        element_types = set()
-        element_ids = set()
+        # Join each field into one separator-delimited string, so every signal
+        # pattern below is a single C-level substring scan over the screen
+        element_texts = []
+        element_types = []
+        element_ids = []
 
         for el in elements:
             if hasattr(el, 'text') and el.text:
-                element_texts.add(el.text.lower())
+                element_texts.append(el.text)
             if hasattr(el, 'content_desc') and el.content_desc:
-                element_texts.add(el.content_desc.lower())
+                element_texts.append(el.content_desc)
             if hasattr(el, 'element_type') and el.element_type:
-                element_types.add(el.element_type)
+                element_types.append(el.element_type)
             if hasattr(el, 'identifier') and el.identifier:
-                element_ids.add(el.identifier.lower())
+                element_ids.append(el.identifier)
+
+        texts = _SIGNAL_SEP.join(element_texts).lower()
+        types = _SIGNAL_SEP.join(element_types)
+        ids = _SIGNAL_SEP.join(element_ids).lower()
 
         # Check each possible state
         best_match = NavigationState.UNKNOWN
         best_score = 0
 
         for state, signal in signals.items():
-            score = self._calculate_signal_score(signal, element_texts, element_types, element_ids)
+            score = self._calculate_signal_score(signal, texts, types, ids)
             if score > best_score:
                 best_score = score
                 best_match = state
@@ -345,29 +351,29 @@ class StateTracker:
 
         return best_match
 
-    def _calculate_signal_score(self, signal: StateSignal, texts: Set[str],
-                                 types: Set[str], ids: Set[str]) -> int:
-        """Calculate match score for a signal"""
+    def _calculate_signal_score(self, signal: StateSignal, texts: str,
+                                 types: str, ids: str) -> int:
+        """Calculate match score for a signal against the joined screen fields"""
         score = 0
 
         # Check required texts
         for text in signal.texts:
-            if any(text.lower() in t for t in texts):
+            if text.lower() in texts:
                 score += 2
 
         # Check element types
         for etype in signal.element_types:
-            if any(etype in t for t in types):
+            if etype in types:
                 score += 1
 
         # Check identifiers
         for ident in signal.identifiers:
-            if any(ident.lower() in i for i in ids):
+            if ident.lower() in ids:
                 score += 2
 
         # Check exclusions (negative score)
         for text in signal.exclude_texts:
-            if any(text.lower() in t for t in texts):
+            if text.lower() in texts:
                 score -= 3
 
         return max(0, score)
@@ -409,18 +415,22 @@ class StateTracker:
 
         Args:
             item: VisitedItem to mark
-            **kwargs: Alternative: create item from kwargs
+            **kwargs: Alternative: create item from kwargs (an explicit
+                item_id is kept, otherwise one is generated from the fields)
 
         Returns:
             Item ID
         """
         if item is None:
+            item_id = kwargs.pop("item_id", None)
             item = VisitedItem.from_post(platform=self.platform, **kwargs)
+            if item_id:
+                item.item_id = item_id
 
         self.visited[item.item_id] = item
         self.stats["posts_visited"] += 1
 
-        logger.debug(f"Marked visited: {item.item_id[:8]} - {item.title[:30] if item.title else 'untitled'}")
+        logger.debug("Marked visited: %s - %s", item.item_id[:8], item.title[:30] if item.title else "untitled")
         return item.item_id
 
     def is_visited(self, item_id: str = None, title: str = None,
@@ -434,13 +444,7 @@ class StateTracker:
             return item_id in self.visited
 
         # Generate ID from fields
-        check_item = VisitedItem.from_post(
-            title=title or "",
-            author=author or "",
-            index=index,
-            platform=self.platform
-        )
-        return check_item.item_id in self.visited
+        return generate_post_id(title or "", author or "", index, self.platform) in self.visited
 
     def get_visited_count(self) -> int:
         """Get number of visited items"""
@@ -603,7 +607,7 @@ def generate_post_id(title: str = "", author: str = "", index: int = 0,
                      platform: str = "") -> str:
     """Generate unique post ID from available data"""
     hash_input = f"{title}|{author}|{index}|{platform}"
-    return hashlib.md5(hash_input.encode()).hexdigest()[:16]
+    return hashlib.blake2b(hash_input.encode(), digest_size=8).hexdigest()
 
 
 def create_tracker_for_platform(platform: str) -> StateTracker:
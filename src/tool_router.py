@@ -27,8 +27,10 @@ Usage:
     router.swipe("up")
 """
 import os
+import re
 import sys
 import time
+import functools
 from typing import Optional, Dict, List, Tuple, Any, Callable, Union
 from dataclasses import dataclass
 from enum import Enum
@@ -39,11 +41,13 @@ sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
 
 from logger import get_logger
 from adb_helper import (
-    ADBHelper, run_adb, tap, swipe, type_text as adb_type_text,
+    ADBHelper, run_adb, run_adb_shell, tap, swipe, long_press as adb_long_press,
+    type_text as adb_type_text,
     press_key, press_back, press_home, press_enter, launch_app, stop_app,
     get_screen_size, screenshot
 )
 from executor import DeterministicExecutor, ScreenState, Element, ExecutionResult, ActionResult
+from data_utils import DATACLASS_SLOTS
 
 # Try to import U2Driver
 try:
@@ -55,6 +59,20 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+# Focused window's package in `dumpsys window windows` output
+_FOCUS_RE = re.compile(r'mCurrentFocus=.*?([a-zA-Z0-9_.]+)/[a-zA-Z0-9_.]+')
+
+
+def _input_action(method):
+    """Invalidate the executor's cached screen once an input method has run"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.executor.invalidate()
+    return wrapper
+
 
 class ToolType(Enum):
     """Tool provider type"""
@@ -64,7 +82,7 @@ class ToolType(Enum):
     AUTO = "auto"  # Auto-select best available
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ClickTarget:
     """Represents a click target"""
     x: int
@@ -106,6 +124,7 @@ class ToolRouter:
                 self.u2 = get_u2_driver(self.device_id)
                 if self.u2 and self.u2.connected:
                     logger.info("U2Driver initialized (selector-based operations enabled)")
+                    self.executor.set_u2_driver(self.u2)
             except Exception as e:
                 logger.warning(f"U2Driver initialization failed: {e}")
                 self.u2 = None
@@ -174,7 +193,7 @@ class ToolRouter:
         Returns list of Element objects with bounds and properties.
         """
         state = self.executor.observe()
-        return state.elements
+        return list(state.elements)
 
     def find_element(self, text: str = None, element_type: str = None,
                      identifier: str = None, **kwargs) -> Optional[Element]:
@@ -211,6 +230,7 @@ class ToolRouter:
     # Click Operations
     # =========================================================================
 
+    @_input_action
     def click(self, x: int = None, y: int = None,
               text: str = None, element_type: str = None,
               identifier: str = None, element: Element = None,
@@ -328,6 +348,7 @@ class ToolRouter:
 
         return None
 
+    @_input_action
     def double_click(self, x: int = None, y: int = None,
                      text: str = None, interval_ms: int = 100) -> Tuple[bool, str]:
         """Double click at target"""
@@ -341,6 +362,7 @@ class ToolRouter:
 
         return ok1 and ok2, msg
 
+    @_input_action
     def long_press(self, x: int = None, y: int = None,
                    text: str = None, duration_ms: int = 1000) -> Tuple[bool, str]:
         """Long press at target"""
@@ -348,19 +370,14 @@ class ToolRouter:
         if not target:
             return False, "Could not resolve target"
 
-        # Long press is implemented as swipe with same start/end
-        args = ["shell", "input", "swipe",
-                str(target.x), str(target.y), str(target.x), str(target.y),
-                str(duration_ms)]
-        if self.device_id:
-            args = ["-s", self.device_id] + args
-
-        return run_adb(args)
+        # Long press is a swipe with same start/end, over the persistent shell
+        return adb_long_press(target.x, target.y, duration_ms, self.device_id)
 
     # =========================================================================
     # Text Input Operations
     # =========================================================================
 
+    @_input_action
     def type_text(self, text: str, submit: bool = False) -> Tuple[bool, str]:
         """
         Type text into focused element.
@@ -430,6 +447,7 @@ class ToolRouter:
     # Swipe/Scroll Operations
     # =========================================================================
 
+    @_input_action
     def swipe(self, direction: str = "up", distance: int = None,
               x: int = None, y: int = None, verify: bool = True) -> Tuple[bool, str]:
         """
@@ -515,6 +533,7 @@ class ToolRouter:
     # Button/Key Operations
     # =========================================================================
 
+    @_input_action
     def press_button(self, button: str) -> Tuple[bool, str]:
         """
         Press hardware/soft button.
@@ -543,6 +562,7 @@ class ToolRouter:
                 return press_key(KEYCODE[button], self.device_id)
             return False, f"Unknown button: {button}"
 
+    @_input_action
     def back(self, verify: bool = True) -> Tuple[bool, str]:
         """Press back button"""
         if verify:
@@ -553,6 +573,7 @@ class ToolRouter:
 
         return press_back(self.device_id)
 
+    @_input_action
     def home(self) -> Tuple[bool, str]:
         """Press home button"""
         return press_home(self.device_id)
@@ -561,6 +582,7 @@ class ToolRouter:
     # App Operations
     # =========================================================================
 
+    @_input_action
     def launch_app(self, package: str, wait: float = 2.0) -> Tuple[bool, str]:
         """
         Launch app by package name.
@@ -585,6 +607,7 @@ class ToolRouter:
             time.sleep(wait)
         return ok, msg
 
+    @_input_action
     def stop_app(self, package: str) -> Tuple[bool, str]:
         """Force stop app"""
         return stop_app(package, self.device_id)
@@ -616,6 +639,16 @@ class ToolRouter:
         """Wait for text to appear"""
         return self.executor.wait_for_text(text, timeout)
 
+    def wait_for(self, predicate: Callable[[ScreenState], bool], timeout: float = 3.0,
+                 poll: float = 0.15) -> Tuple[bool, ScreenState]:
+        """
+        Wait until predicate(state) holds, returning as soon as it does.
+
+        Returns:
+            (matched, last observed state) tuple
+        """
+        return self.executor.wait_until(predicate, timeout, poll)
+
     def wait(self, seconds: float):
         """Simple wait"""
         time.sleep(seconds)
@@ -654,6 +687,10 @@ class ToolRouter:
         """Get current screen state"""
         return self.executor.observe()
 
+    def observe_focused_window(self) -> ScreenState:
+        """Get a compressed dump of the focused window (for lookups, not verification)"""
+        return self.executor.observe_compact()
+
     def has_text(self, text: str) -> bool:
         """Check if text is visible"""
         return self.executor.has_text(text)
@@ -669,14 +706,11 @@ class ToolRouter:
             except Exception:
                 pass
 
-        args = ["shell", "dumpsys", "window", "windows"]
-        if self.device_id:
-            args = ["-s", self.device_id] + args
-
-        ok, output = run_adb(args)
+        # Filter on the device: only the focus line crosses the persistent shell
+        ok, output = run_adb_shell(["dumpsys", "window", "windows", "|", "grep", "mCurrentFocus",
+                                    "||", "true"], self.device_id)
         if ok:
-            import re
-            match = re.search(r'mCurrentFocus=.*?([a-zA-Z0-9_.]+)/[a-zA-Z0-9_.]+', output)
+            match = _FOCUS_RE.search(output)
             if match:
                 return match.group(1)
         return None
@@ -690,6 +724,7 @@ class ToolRouter:
         """Check if uiautomator2 is available and connected"""
         return self.u2 is not None and self.u2.connected
 
+    @_input_action
     def click_by_selector(self, timeout: float = 5.0, **selector) -> Tuple[bool, str]:
         """
         Click element using uiautomator2 selector (no coordinate lookup needed).
@@ -720,6 +755,7 @@ class ToolRouter:
 
         return self.u2.click_by_selector(timeout=timeout, **selector)
 
+    @_input_action
     def click_if_exists(self, timeout: float = 3.0, **selector) -> bool:
         """
         Click element if it exists (no error if not found).
@@ -759,10 +795,10 @@ class ToolRouter:
         if not self.u2_available:
             # Fallback to executor
             if gone:
-                # Poll for element to disappear
+                # Poll for element to disappear (fresh dump each round)
                 start = time.time()
                 while time.time() - start < timeout:
-                    if not self.has_text(list(selector.values())[0] if selector else ""):
+                    if self.executor.observe().find(**selector) is None:
                         return True, None
                     time.sleep(0.5)
                 return False, None
@@ -771,6 +807,7 @@ class ToolRouter:
 
         return self.u2.wait_for_element(timeout=timeout, gone=gone, **selector)
 
+    @_input_action
     def scroll_to_element(self, max_scrolls: int = 10, direction: str = "down",
                           **selector) -> Tuple[bool, Any]:
         """
@@ -797,6 +834,7 @@ class ToolRouter:
 
         return self.u2.scroll_to(direction=direction, max_scrolls=max_scrolls, **selector)
 
+    @_input_action
     def type_into_element(self, text: str, clear_first: bool = True,
                           **selector) -> Tuple[bool, str]:
         """
@@ -835,10 +873,7 @@ class ToolRouter:
             try:
                 dump_path = "/sdcard/window_dump.xml"
                 local_path = os.path.join(PROJECT_ROOT, "temp", "hierarchy_dump.xml")
-                args = ["shell", "uiautomator", "dump", dump_path]
-                if self.device_id:
-                    args = ["-s", self.device_id] + args
-                run_adb(args)
+                run_adb_shell(["uiautomator", "dump", dump_path], self.device_id)
 
                 pull_args = ["pull", dump_path, local_path]
                 if self.device_id:
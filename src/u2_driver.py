@@ -301,6 +301,24 @@ class U2Driver:
             logger.error(f"wait_for_element failed: {e}")
             return False, None
 
+    def wait_exists(self, timeout: float = 10.0, **selector) -> Optional[bool]:
+        """
+        Wait for element to appear, without fetching its info.
+
+        Args:
+            timeout: Wait timeout
+            **selector: Selector kwargs
+
+        Returns:
+            True if it appeared, False on timeout, None if the wait itself failed
+        """
+        try:
+            self._ensure_connected()
+            return bool(self.device(**selector).wait(timeout=timeout))
+        except Exception as e:
+            logger.error(f"wait_exists failed: {e}")
+            return None
+
     def wait_for_text(self, text: str, timeout: float = 10.0,
                       gone: bool = False) -> bool:
         """
@@ -4,6 +4,7 @@ Unit tests for src/executor.py - Deterministic Executor
 """
 import os
 import sys
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
@@ -153,6 +154,16 @@ class TestScreenState:
 
         assert state1.screen_hash != state2.screen_hash
 
+    def test_screen_hash_lazy(self, mock_elements):
+        """Test screen hash is computed on demand and explicit hashes are kept"""
+        state = ScreenState.from_elements(mock_elements)
+        assert state._screen_hash is None
+        assert len(state.screen_hash) == 12
+        assert state.screen_hash == ScreenState.from_elements(mock_elements).screen_hash
+
+        error_state = ScreenState(elements=[], timestamp=0.0, screen_hash="error")
+        assert error_state.screen_hash == "error"
+
     def test_find_element(self, mock_elements):
         """Test finding element in state"""
         state = ScreenState.from_elements(mock_elements)
@@ -182,6 +193,73 @@ class TestScreenState:
         buttons = state.find_all(type="Button")
         assert len(buttons) >= 1
 
+    def test_find_matches_element_semantics(self, mock_elements):
+        """Test state search agrees with Element.matches for every criterion"""
+        state = ScreenState.from_elements(mock_elements)
+        queries = [
+            {"text": "search"},
+            {"type": "button", "clickable": True},
+            {"clickable": False},
+            {"text_exact": "Search"},
+            {"content_desc": "SEARCH"},
+            {"identifier": "id/"},
+            {"textContains": "search", "text": None},
+            {"text": "e", "clickable": False},
+            {"text": "", "type": "text"},
+            {"text_exact": "Search", "clickable": True},
+            {"clickable": True, "scrollable": False},
+            {"text_exact": "missing", "clickable": True},
+        ]
+
+        for criteria in queries:
+            expected = [el for el in state.elements if el.matches(**criteria)]
+            assert state.find_all(**criteria) == expected
+            assert state.find(**criteria) == (expected[0] if expected else None)
+            assert state.count(**criteria) == len(expected)
+
+    def test_find_memoized_per_screen(self, mock_elements):
+        """Test repeated lookups on the same screen reuse the first search"""
+        state = ScreenState.from_elements(mock_elements)
+        first = state.find(type="TextView", clickable=True)
+
+        with patch.object(ScreenState, '_find_first') as search:
+            assert state.refreshed().find(clickable=True, className="textview") is first
+            search.assert_not_called()
+
+    def test_find_any_text_keeps_priority_order(self, mock_elements):
+        """Test earlier alternatives win over elements higher on the screen"""
+        state = ScreenState.from_elements(mock_elements)
+
+        assert state.find_any_text(["LIKE", "comment"]).text == "Like"
+        assert state.find_any_text(["comment", "LIKE"]).text == "Comment"
+        assert state.find_any_text(["second post"]) == state.find(text="second post")
+        assert state.find_any_text(["missing", "absent"]) is None
+        assert state.find_any_text([]) is None
+
+        post = ScreenState.from_elements([
+            {"text": "留言 welcome in the post body", "type": "TextView"},
+            {"text": "Comments", "type": "Button"},
+        ])
+        assert post.find_any_text(["comment", "留言"]).text == "Comments"
+
+    def test_find_unknown_criterion_ignored(self, mock_elements):
+        """Test unsupported criteria are ignored rather than rejected"""
+        state = ScreenState.from_elements(mock_elements)
+
+        assert state.find(text="post", checked=True) == state.find(text="post")
+        assert state.elements[0].matches(index=3)
+
+    def test_find_description_is_exact(self):
+        """Test the u2-style description key matches content_desc exactly"""
+        state = ScreenState.from_elements([
+            {"text": "", "contentDescription": "Search posts"},
+            {"text": "", "contentDescription": "Search"},
+        ])
+
+        assert state.find(description="Search") is state.elements[1]
+        assert state.find(descriptionContains="search") is state.elements[0]
+        assert state.find(description="search") is None
+
     def test_has_text(self, mock_elements):
         """Test checking for text presence"""
         state = ScreenState.from_elements(mock_elements)
@@ -190,6 +268,124 @@ class TestScreenState:
         assert state.has_text("search") is True  # Case insensitive
         assert state.has_text("NonExistent") is False
 
+    def test_has_text_substring_fallback(self, mock_elements):
+        """Test has_text matches partial text and content descriptions"""
+        state = ScreenState.from_elements(mock_elements)
+
+        for probe in ["sea", "SEARCH", "arch", "", "nonexistent"]:
+            expected = any(probe.lower() in (e.text or "").lower()
+                           or probe.lower() in (e.content_desc or "").lower()
+                           for e in state.elements)
+            assert state.has_text(probe) is expected
+        assert ScreenState(elements=[], timestamp=0).has_text("") is False
+
+    def test_from_xml_document_order(self):
+        """Test uiautomator XML parsing keeps parents before children"""
+        xml = (
+            "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>"
+            "<hierarchy rotation=\"0\">"
+            "<node class=\"android.widget.FrameLayout\" bounds=\"[0,0][1080,2400]\">"
+            "<node text=\"搜尋\" resource-id=\"com.app:id/search\" class=\"android.widget.Button\""
+            " bounds=\"[100,200][180,260]\" clickable=\"true\" enabled=\"true\"/>"
+            "</node>"
+            "</hierarchy>"
+        )
+        state = ScreenState.from_xml(xml)
+
+        assert [e.element_type for e in state.elements] == [
+            "android.widget.FrameLayout", "android.widget.Button"
+        ]
+        button = state.elements[1]
+        assert button.text == "搜尋"
+        assert button.clickable is True
+        assert button.center == (140, 230)
+        assert button.raw["resource-id"] == "com.app:id/search"
+
+    def test_from_xml_interns_repeated_attributes(self):
+        """Test repeated class names are shared between parsed elements"""
+        node = "<node class=\"android.widget.TextView\" text=\"{}\" bounds=\"[0,0][10,10]\"/>"
+        xml = "<hierarchy>" + node.format("a") + node.format("b") + "</hierarchy>"
+        first, second = ScreenState.from_xml(xml.encode("utf-8")).elements
+
+        assert first.element_type is second.element_type
+        assert first._element_type_lower is second._element_type_lower
+
+    def test_from_xml_builds_elements_on_access(self):
+        """Test searching an XML state only builds the elements it returns"""
+        node = "<node class=\"android.widget.TextView\" text=\"{}\" bounds=\"[0,0][10,10]\"/>"
+        xml = "<hierarchy>" + "".join(node.format(f"Item {i}") for i in range(5)) + "</hierarchy>"
+        state = ScreenState.from_xml(xml)
+
+        assert state.find(text="item 3").text == "Item 3"
+        assert state.has_text("Item 4")
+        assert sum(e is not None for e in state.elements._built) == 1
+        assert len(state.elements) == 5
+        assert state.elements[-1].text == "Item 4"
+        assert [e.text for e in state.elements[1:3]] == ["Item 1", "Item 2"]
+        assert state.elements == list(state.elements)
+        assert state.column('text_exact') == [f"Item {i}" for i in range(5)]
+        assert state.column('textContains')[0] == "item 0"
+
+        with pytest.raises(ValueError):
+            state.column('bounds')
+
+    def test_from_xml_columns_match_elements(self):
+        """Test node-attribute columns agree with the columns of built Elements"""
+        xml = (
+            '<hierarchy><node text="Hi There" content-desc="Open Menu" class="android.widget.Button"'
+            ' resource-id="app:id/Menu" clickable="true" scrollable="false" bounds="[0,0][1,1]"/>'
+            '<node text="" class="android.widget.ListView" scrollable="true" bounds="[0,0][1,1]"/>'
+            '</hierarchy>'
+        )
+        lazy = ScreenState.from_xml(xml)
+        built = ScreenState(elements=list(lazy.elements), timestamp=0.0)
+
+        for key in ("text", "text_exact", "type", "identifier", "content_desc",
+                    "description", "clickable", "scrollable"):
+            assert lazy.column(key) == built.column(key)
+
+    def test_reuse_elements_from_previous_dump(self):
+        """Test unchanged nodes take the Element built for the previous dump"""
+        node = "<node class=\"android.widget.TextView\" text=\"{}\" bounds=\"[0,{}][10,{}]\"/>"
+
+        def dump(items):
+            return "<hierarchy>" + "".join(node.format(t, y, y + 10) for t, y in items) + "</hierarchy>"
+
+        before = ScreenState.from_xml(dump([("A", 0), ("B", 10), ("C", 20)]))
+        kept, moved = before.elements[1], before.elements[2]
+
+        after = ScreenState.from_xml(dump([("B", 10), ("C", 0), ("D", 20)]))
+        after.reuse_elements(before)
+
+        assert after.elements[0] is kept
+        assert after.elements[1] is not moved and after.elements[1].center == (5, 5)
+        assert after.elements[2].text == "D"
+
+    def test_reuse_elements_requires_same_raw_attributes(self):
+        """Test a node whose other attributes changed gets a fresh Element"""
+        node = '<node text="Wi-Fi" class="android.widget.Switch" checked="{}" bounds="[0,0][10,10]"/>'
+        before = ScreenState.from_xml("<hierarchy>" + node.format("false") + "</hierarchy>")
+        old = before.elements[0]
+
+        after = ScreenState.from_xml("<hierarchy>" + node.format("true") + "</hierarchy>")
+        after.reuse_elements(before)
+
+        assert after.elements[0] is not old
+        assert after.elements[0].raw["checked"] == "true"
+
+    def test_from_xml_rotation(self):
+        """Test the hierarchy rotation is kept on the state"""
+        landscape = ScreenState.from_xml('<hierarchy rotation="1"><node text="A"/></hierarchy>')
+        assert landscape.rotation == 1
+        assert landscape.refreshed().rotation == 1
+        assert ScreenState.from_xml('<hierarchy><node text="A"/></hierarchy>').rotation is None
+
+    def test_from_xml_invalid(self):
+        """Test malformed XML yields an empty state"""
+        state = ScreenState.from_xml("<hierarchy><node")
+
+        assert state.elements == []
+
     def test_parse_bounds_mcp_format(self):
         """Test parsing bounds from MCP format"""
         el = {"x": 100, "y": 200, "width": 80, "height": 60}
@@ -209,6 +405,14 @@ class TestScreenState:
         assert bounds["width"] == 80
         assert bounds["height"] == 60
 
+    def test_parse_bounds_string_irregular(self):
+        """Test bounds strings outside the fast path"""
+        assert ScreenState._parse_bounds_string(" [0,0][10,20] ") == \
+            {"x": 0, "y": 0, "width": 10, "height": 20}
+        assert ScreenState._parse_bounds_string("[0,0]") == {}
+        assert ScreenState._parse_bounds_string("[a,b][c,d]") == {}
+        assert ScreenState._parse_bounds_string("") == {}
+
 
 # =============================================================================
 # DeterministicExecutor Tests
@@ -244,6 +448,206 @@ class TestDeterministicExecutor:
         assert len(state.elements) == len(mock_elements)
         assert executor.last_state == state
 
+    def test_observe_unchanged_dump_reuses_state(self, executor, mock_elements):
+        """Test identical dumps skip re-parsing but still yield a fresh state"""
+        import copy
+        executor.set_mcp_callback(lambda: copy.deepcopy(mock_elements))
+        first = executor.observe()
+        second = executor.observe()
+
+        assert second is not first
+        assert second.elements is first.elements
+        assert second.screen_hash == first.screen_hash
+        assert len(executor.state_history) == 2
+
+    def test_observe_max_age_reuses_until_input(self, executor, mock_mcp_callback):
+        """Test recent states are reused until an input action invalidates them"""
+        callback = Mock(wraps=mock_mcp_callback)
+        executor.set_mcp_callback(callback)
+        first = executor.observe(max_age=60)
+        assert executor.observe(max_age=60) is first
+        assert callback.call_count == 1
+
+        executor.invalidate()
+        assert executor.observe(max_age=60) is not first
+        assert callback.call_count == 2
+
+    def test_observe_via_u2(self, executor):
+        """Test observation via uiautomator2 hierarchy dump"""
+        driver = Mock()
+        driver.dump_hierarchy.return_value = (
+            '<hierarchy><node text="Search" class="android.widget.Button"'
+            ' bounds="[0,0][100,50]" clickable="true"/></hierarchy>'
+        )
+        executor.set_u2_driver(driver)
+        state = executor.observe(use_mcp=False)
+
+        driver.dump_hierarchy.assert_called_once_with(compressed=False)
+        assert state.find(text="Search").clickable is True
+        assert executor.last_state == state
+
+    def test_observe_via_exec_out_dump(self, executor):
+        """Test uiautomator fallback reads the dump from exec-out stdout"""
+        output = (
+            b'<?xml version=\'1.0\' encoding=\'UTF-8\' standalone=\'yes\' ?>'
+            b'<hierarchy rotation="0"><node text="Search" bounds="[0,0][100,50]"/></hierarchy>'
+            b'UI hierchary dumped to: /dev/tty\n'
+        )
+        with patch('executor.run_adb_raw', return_value=(True, output)) as raw, \
+                patch('executor.run_adb') as run:
+            state = executor.observe(use_mcp=False)
+
+        assert raw.call_args[0][0][-4:] == ["exec-out", "uiautomator", "dump", "/dev/tty"]
+        run.assert_not_called()
+        assert [e.text for e in state.elements] == ["Search"]
+        assert state.raw_data.endswith(b"</hierarchy>")
+
+    def test_observe_compressed_dumps_option(self, executor):
+        """Test the compressed_dumps option switches the observe dump to --compressed"""
+        output = b'<hierarchy rotation="0"><node text="Search" bounds="[0,0][100,50]"/></hierarchy>'
+        executor.compressed_dumps = True
+        with patch('executor.run_adb_raw', return_value=(True, output)) as raw:
+            state = executor.observe(use_mcp=False)
+
+        assert raw.call_args[0][0][-3:] == ["dump", "--compressed", "/dev/tty"]
+        assert executor.last_state is state
+
+    def test_observe_compact_leaves_last_state(self, executor):
+        """Test compressed dumps serve lookups without replacing last_state"""
+        output = b'<hierarchy rotation="0"><node text="Search" bounds="[0,0][100,50]"/></hierarchy>'
+        with patch('executor.run_adb_raw', return_value=(True, output)) as raw:
+            state = executor.observe_compact()
+
+        assert "--compressed" in raw.call_args[0][0]
+        assert [e.text for e in state.elements] == ["Search"]
+        assert executor.last_state is None
+
+    def test_observe_skips_pull_when_dump_checksum_unchanged(self, executor, tmp_path):
+        """Test dump + pull fallback reuses the last state when md5sum matches"""
+        xml = '<hierarchy><node text="Search" bounds="[0,0][100,50]"/></hierarchy>'
+
+        def fake_pull(args, timeout=30):
+            with open(args[-1], "w", encoding="utf-8") as f:
+                f.write(xml)
+            return True, ""
+
+        dump_output = ("UI hierchary dumped to: /sdcard/window_dump.xml\n"
+                       "0123456789abcdef0123456789abcdef  /sdcard/window_dump.xml")
+        executor._exec_out_dump = False
+        executor._local_dump_path = str(tmp_path / "window_dump.xml")
+        with patch('executor.run_adb_shell', return_value=(True, dump_output)) as shell, \
+                patch('executor.run_adb', side_effect=fake_pull) as pull:
+            first = executor.observe(use_mcp=False)
+            second = executor.observe(use_mcp=False)
+
+        assert shell.call_count == 2
+        assert pull.call_count == 1
+        assert second.elements is first.elements
+
+    def test_swipe_and_verify_returns_one_poll_after_change(self, executor):
+        """Test swipe verification takes one extra dump after the screen changes"""
+        screens = [[{"text": f"Item {i}", "type": "TextView", "identifier": "", "x": 0, "y": 0}]
+                   for i in range(6)]
+        # Every dump differs, like an animating feed that never settles
+        executor.set_mcp_callback(Mock(side_effect=screens))
+        executor.adb = Mock()
+        executor.adb.get_screen_size.return_value = (1080, 2400)
+
+        with patch('executor.swipe', return_value=(True, "")), patch('executor.time.sleep'):
+            result = executor.swipe_and_verify("up")
+
+        assert result.result == ActionResult.SUCCESS
+        assert result.after_state.has_text("Item 2")
+        assert executor._mcp_callback.call_count == 3
+
+    def test_wait_for_screen_settle(self, executor):
+        """Test settle detection returns on the first repeated screen"""
+        moving = [{"text": "Item 1", "type": "TextView", "identifier": "", "x": 0, "y": 0}]
+        settled = [{"text": "Item 2", "type": "TextView", "identifier": "", "x": 0, "y": 0}]
+        executor.set_mcp_callback(Mock(side_effect=[moving, settled, settled]))
+
+        with patch('executor.time.sleep'):
+            assert executor.wait_for_screen_settle(timeout=5) is True
+
+        assert executor._mcp_callback.call_count == 3
+
+    def test_wait_until_returns_once_predicate_holds(self, executor):
+        """Test condition waits exit on the first matching screen"""
+        loading = [{"text": "Loading", "type": "TextView", "identifier": "", "x": 0, "y": 0}]
+        results = [{"text": "Results", "type": "TextView", "identifier": "", "x": 0, "y": 0}]
+        executor.set_mcp_callback(Mock(side_effect=[loading, results, results]))
+
+        with patch('executor.time.sleep') as sleep:
+            matched, state = executor.wait_until(lambda s: s.has_text("Results"), timeout=5)
+
+        assert matched is True
+        assert state.has_text("Results")
+        assert sleep.call_count == 1
+
+    def test_screen_size_follows_rotation(self, executor):
+        """Test width and height swap when the last dump is in landscape"""
+        executor.adb = Mock()
+        executor.adb.get_screen_size.return_value = (1080, 2400)
+        assert executor._get_screen_size() == (1080, 2400)
+
+        executor.last_state = ScreenState(elements=[], timestamp=0.0, rotation=3)
+        assert executor._get_screen_size() == (2400, 1080)
+
+    def test_wait_for_element_uses_device_wait(self, executor, mock_mcp_callback):
+        """Test waits are delegated to the uiautomator2 server when connected"""
+        driver = Mock(connected=True)
+        driver.wait_exists.return_value = True
+        driver.dump_hierarchy.return_value = (
+            '<hierarchy><node text="Search" class="android.widget.Button"'
+            ' bounds="[0,0][100,50]" clickable="true"/></hierarchy>'
+        )
+        executor.set_u2_driver(driver)
+
+        found, element = executor.wait_for_element(timeout=1, text="search", clickable=True)
+
+        assert found and element.text == "Search"
+        driver.wait_exists.assert_called_once_with(
+            timeout=1, textMatches="(?isu).*\\Qsearch\\E.*", clickable=True
+        )
+
+        driver.wait_exists.return_value = False
+        assert executor.wait_for_element(timeout=1, text="Missing") == (False, None)
+        assert driver.dump_hierarchy.call_count == 1
+
+    def test_wait_for_element_checks_screen_after_slow_device_wait(self, executor):
+        """Test a device-side hit is confirmed even when the wait used the whole timeout"""
+        driver = Mock(connected=True)
+        driver.dump_hierarchy.return_value = (
+            '<hierarchy><node text="Search" bounds="[0,0][100,50]"/></hierarchy>'
+        )
+
+        def slow_wait(timeout, **selector):
+            time.sleep(timeout)
+            return True
+
+        driver.wait_exists.side_effect = slow_wait
+        executor.set_u2_driver(driver)
+
+        found, element = executor.wait_for_element(timeout=0.05, text="Search")
+
+        assert found and element.text == "Search"
+
+    def test_wait_for_element_polls_when_device_wait_fails(self, executor):
+        """Test a failed device wait falls back to polling dumps"""
+        driver = Mock(connected=True)
+        driver.wait_exists.return_value = None
+        driver.dump_hierarchy.side_effect = [
+            '<hierarchy><node text="Loading" bounds="[0,0][100,50]"/></hierarchy>',
+            '<hierarchy><node text="Search" bounds="[0,0][100,50]"/></hierarchy>',
+        ]
+        executor.set_u2_driver(driver)
+
+        with patch('executor.time.sleep'):
+            found, element = executor.wait_for_element(timeout=5, text="Search")
+
+        assert found and element.text == "Search"
+        assert driver.dump_hierarchy.call_count == 2
+
     def test_find_element(self, executor, mock_mcp_callback):
         """Test finding element after observation"""
         executor.set_mcp_callback(mock_mcp_callback)
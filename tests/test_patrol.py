@@ -8,6 +8,7 @@ import sys
 import time
 import json
 import pytest
+from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 
 # Add src to path
@@ -129,6 +130,13 @@ class TestStateTracker:
         assert tracker.is_visited(title="Test Post", author="@test", index=0) is True
         assert tracker.is_visited(title="Different", author="@test", index=0) is False
 
+    def test_mark_visited_keeps_explicit_id(self, tracker):
+        """Test an item_id passed to mark_visited is the one is_visited sees"""
+        item_id = tracker.mark_visited(item_id="post-1", title="Test Post", author="@test")
+
+        assert item_id == "post-1"
+        assert tracker.is_visited(item_id="post-1") is True
+
     def test_get_visited_count(self, tracker):
         """Test getting visited count"""
         assert tracker.get_visited_count() == 0
@@ -398,8 +406,7 @@ class TestPatrolStateMachine:
     @pytest.fixture
     def patrol_machine(self, tmp_path):
         """Create patrol machine with mocked dependencies"""
-        with patch('src.patrol.DeterministicExecutor'), \
-             patch('src.patrol.ToolRouter'), \
+        with patch('src.patrol.ToolRouter'), \
              patch('src.state_tracker.DATA_DIR', str(tmp_path)):
 
             config = PatrolConfig(max_posts=3, max_scrolls=2)
@@ -464,6 +471,153 @@ class TestPatrolStateMachine:
 
         assert patrol_machine.state == PatrolState.STOPPED
 
+    def test_run_keeps_loaded_tracker(self, patrol_machine):
+        """Test run() keeps a tracker the caller loaded or pre-seeded"""
+        patrol_machine.config.auto_save_report = False
+        tracker = patrol_machine.tracker
+
+        with patch.object(patrol_machine, '_launch_app', return_value=False):
+            patrol_machine.run("keyword")
+
+        assert patrol_machine.tracker is tracker
+
+    def test_reset_clears_tracking(self, patrol_machine, tmp_path):
+        """Test reset() gives a reused machine fresh per-run tracking"""
+        patrol_machine.posts_collected = [PostData()]
+        patrol_machine.scroll_count = 2
+        patrol_machine.error_count = 1
+        previous_tracker = patrol_machine.tracker
+
+        with patch('state_tracker.DATA_DIR', str(tmp_path)):
+            patrol_machine.reset()
+
+        assert patrol_machine.posts_collected == []
+        assert patrol_machine.scroll_count == 0
+        assert patrol_machine.error_count == 0
+        assert patrol_machine.tracker is not previous_tracker
+
+    def test_next_unvisited_post(self, patrol_machine):
+        """Test the scan skips visited posts and stops at the first unvisited one"""
+        from executor import Element, ScreenState
+        elements = [
+            Element(text="@user1", clickable=True),
+            Element(text="First post content that is long enough"),
+            Element(text="@user2", clickable=True),
+            Element(text="Second post content that is long enough"),
+        ]
+        patrol_machine.executor = Mock()
+        patrol_machine.executor.observe.return_value = ScreenState(elements=elements, timestamp=0.0)
+
+        first, found_any = patrol_machine._next_unvisited_post()
+        assert found_any and first["author"] == "@user1"
+
+        patrol_machine.tracker.mark_visited(item_id=first["id"])
+        second, _ = patrol_machine._next_unvisited_post()
+        assert second["author"] == "@user2"
+
+        patrol_machine.tracker.mark_visited(item_id=second["id"])
+        assert patrol_machine._next_unvisited_post() == (None, True)
+
+    def test_collect_post_data_engagement(self, patrol_machine):
+        """Test engagement labels are classified in likes, comments, shares order"""
+        from executor import Element, ScreenState
+        elements = [
+            Element(text="Post body"),
+            Element(text="12 Likes"),
+            Element(text="Share"),
+            Element(text="Liked and shared"),
+        ]
+        patrol_machine.executor = Mock()
+        patrol_machine.executor.observe.return_value = ScreenState(elements=elements, timestamp=0.0)
+
+        data = patrol_machine._collect_post_data({"text": "Post body", "id": "p1"})
+
+        # "Liked and shared" has both labels: likes is checked first
+        assert data.engagement["likes"] == "Liked and shared"
+        assert data.engagement["shares"] == "Share"
+
+    def test_read_post_comments_skips_repeated_text(self, patrol_machine):
+        """Test comments still on screen after a scroll are collected once"""
+        from executor import Element, ScreenState, ExecutionResult, ActionResult
+        elements = [
+            Element(text="View comments", clickable=True),
+            Element(text="First comment that is long enough"),
+            Element(text="Second comment that is long enough"),
+        ]
+        state = ScreenState(elements=elements, timestamp=0.0)
+        patrol_machine.executor = Mock()
+        patrol_machine.executor.observe.return_value = state
+        patrol_machine.executor.click_and_verify.return_value = ExecutionResult(result=ActionResult.SUCCESS)
+        patrol_machine.router = Mock()
+        patrol_machine.router.wait_for.return_value = (True, state)
+        patrol_machine.config.comment_scrolls = 3
+        patrol_machine.current_post = PostData()
+
+        patrol_machine._read_post_comments()
+
+        texts = [c["text"] for c in patrol_machine.current_post.comments]
+        assert texts == ["View comments", "First comment that is long enough",
+                         "Second comment that is long enough"]
+        assert patrol_machine.router.swipe.call_count == 3
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_save_report_serializes_posts(self, patrol_machine, tmp_path, use_orjson):
+        """Test report posts are written field by field to JSONL with either encoder"""
+        import data_utils
+        if use_orjson and not data_utils.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        patrol_machine.report = PatrolReport(keyword="咖啡", platform="threads", start_time=0.0)
+        patrol_machine.report.posts.append(PostData(title="貼文", engagement={"likes": "12"}))
+
+        with patch('patrol.REPORTS_DIR', str(tmp_path)), \
+             patch('data_utils.ORJSON_AVAILABLE', use_orjson):
+            patrol_machine._save_report()
+
+        saved = json.loads(next(tmp_path.glob("patrol_threads_*.json")).read_text(encoding="utf-8"))
+        assert saved["keyword"] == "咖啡"
+        lines = (tmp_path / saved["posts_file"]).read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["title"] == "貼文"
+        assert json.loads(lines[0])["engagement"] == {"likes": "12"}
+
+    def test_posts_streamed_to_jsonl_during_run(self, patrol_machine, tmp_path):
+        """Test each collected post is on disk before the report is finalized"""
+        with patch('patrol.REPORTS_DIR', str(tmp_path)):
+            patrol_machine._open_post_sink()
+        patrol_machine._write_post(PostData(title="first"))
+
+        posts_file = next(tmp_path.glob("patrol_threads_*.jsonl"))
+        assert json.loads(posts_file.read_text(encoding="utf-8"))["title"] == "first"
+
+        patrol_machine.report = PatrolReport(keyword="k", platform="threads", start_time=0.0)
+        patrol_machine._save_report()
+        assert patrol_machine._post_sink is None
+        assert len(posts_file.read_text(encoding="utf-8").splitlines()) == 1
+
+    def test_report_files_unique_within_same_second(self, patrol_machine, tmp_path):
+        """Test runs started in the same second never share report files"""
+        with patch('patrol.REPORTS_DIR', str(tmp_path)), patch('patrol.datetime') as clock:
+            clock.now.return_value = datetime(2026, 1, 1, 12, 0, 0)
+            patrol_machine._open_post_sink()
+            first = patrol_machine._report_base
+            patrol_machine._close_post_sink()
+            patrol_machine._open_post_sink()
+            second = patrol_machine._report_base
+            patrol_machine._close_post_sink()
+
+        assert first != second
+        assert len(list(tmp_path.glob("*.jsonl"))) == 2
+
+    def test_run_closes_posts_file_when_finalizing_fails(self, patrol_machine, tmp_path):
+        """Test the posts file is closed even if the report cannot be finalized"""
+        with patch('patrol.REPORTS_DIR', str(tmp_path)), \
+             patch.object(patrol_machine, '_launch_app', return_value=False), \
+             patch.object(patrol_machine, '_finalize_report', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                patrol_machine.run("keyword")
+
+        assert patrol_machine._post_sink is None
+
     def test_generate_post_id(self, patrol_machine):
         """Test post ID generation"""
         from executor import Element
@@ -59,6 +59,9 @@ ELEMENT_LIST_PATTERN = re.compile(
     re.DOTALL
 )
 
+# Pattern to pull the text field out of a matched MCP response
+MCP_TEXT_FIELD_PATTERN = re.compile(r'"text":\s*"([^"]*)"')
+
 
 def compactMcpResponse(match):
     """Compact MCP tool response to a single line summary."""
@@ -68,7 +71,7 @@ def compactMcpResponse(match):
     # Extract key info from JSON
     if '"text":' in full_match:
         # Find the text content
-        text_match = re.search(r'"text":\s*"([^"]*)"', full_match)
+        text_match = MCP_TEXT_FIELD_PATTERN.search(full_match)
         if text_match:
             text = text_match.group(1)
             # Truncate long text